@@ -1,83 +1,110 @@
+import os, sys
+# the modules shared with RBFS (CompiledGraph, SuccessorQueue, SearchEvents, MapRenderer) are imported from its directory, which goes after this one, so the AIMA Node, utils and GraphProblem are still the ones found
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "RBFS"))
+
 from Node import Node
 from utils import memoize
 from GraphProblem import GraphProblem
 from UnidirectedGraph import UndirectedGraph
+from SuccessorQueue import SuccessorQueue
+from SearchEvents import SearchEventBuffer, SearchEventPlayer
 import numpy as np, json
 
 allVisitedNodes = []
 
+# when true, the search is recorded in a SearchEventBuffer and replayed on the map (with the waiting times below), false runs it headless
 runVisualization = True
 
+# when true, RBFS skips the children whose state is already on its current path
+pruneCycles = False
+
+# when true, the search prints its progress, the pruned children and the path it found
+genVerbose = True
+
+# when true, the graph is compiled once into CSR arrays (GraphProblem.compile), so the states are integer ids and the actions carry their edge cost
+compileGraph = True
+
 # waiting times for the visualization
 waitingStart = 1 # 3
 waitingComplete = 3 # 5
 waitingParent = 1 # 2
 
 print("\nWELCOME to Recursive Best First Search (RBFS)")
-def RecursiveBestFirstSearch(problem, hCost=None):
-    global romaniaMap
+# All the state of a search is local to the call (the visited nodes can be passed in to see them from outside), so many searches can run in threads at the same time
+# events: SearchEventBuffer where the search is recorded for the visualization (as SearchContext does), None to run headless, the search itself never touches the map nor waits
+# pruneCycles: skip the children whose state is already on the current path (the undirected graph always gives back the parent, Arad -> Sibiu -> Arad),
+# the path is kept in a set (added when RBFS goes into a node and removed when it returns), and with verbose the number of skipped children is printed at the end
+def RecursiveBestFirstSearch(problem, hCost=None, visitedNodes=None, pruneCycles=False, events=None, verbose=False):
     hCost = memoize(hCost or problem.hCost, 'hCost')
+    visitedNodes = [] if visitedNodes is None else visitedNodes
+    pathStates = set()
+    prunedChildren = 0
 
     def RBFS(problem, node, flimit):
-        allVisitedNodes.append(node.state) # For visualization
+        nonlocal prunedChildren
+        visitedNodes.append(problem.stateName(node.state))
 
         if problem.goal_test(node.state):
-            print("GOAL REACHED")
+            if verbose : print("GOAL REACHED")
             return node, 0
         
         children = node.expand(problem)
-
+        if pruneCycles:
+            pathStates.add(node.state)
+            generated = len(children)
+            children = [child for child in children if child.state not in pathStates]
+            prunedChildren += generated - len(children)
+            try:
+                return expandChildren(problem, node, children, flimit)
+            finally:
+                pathStates.discard(node.state)
+        return expandChildren(problem, node, children, flimit)
+
+    # the RBFS loop on the children of node (after they were pruned)
+    def expandChildren(problem, node, children, flimit):
         if len(children) == 0:
             return None, np.inf
         
-        if runVisualization : time.sleep(waitingParent) ## For visualization
+        if events is not None : events.append(("expand", node.state, None))
         for child in children:
             child.fCost = max(child.pathCost + hCost(child), node.fCost)
-            romaniaMap.updateState(child.state, "frontier") # For visualization
-        
-        if runVisualization : time.sleep(waitingComplete)
-        romaniaMap.resetAllStates() ## For visualization
+            if events is not None : events.append(("frontier", child.state, child.fCost))
+        if events is not None : events.append(("reset", None, None))
         
+        # Ordered by lowest fCost value
+        children = SuccessorQueue(children)
         while True:
-            # Order by lowest fCost value
-            children.sort(key=lambda x: x.fCost)
-            best = children[0]
-            if best.fCost > flimit:
+            best = children.best()
+            if best.fCost > flimit or best.fCost == np.inf:
                 return None, best.fCost
-            if len(children) > 1:
-                alternative = children[1].fCost
-            else:
-                alternative = np.inf
-            
-            ### Updates Visuals
-            romaniaMap.updateState(best.state, "open")
-            romaniaMap.maxPath = best.pathCost
-            romaniaMap.mainNodeText = f"Visited Node : {best.state}"
-
-            result, best.fCost = RBFS(problem, best, min(flimit, alternative))
+            alternative = children.alternative()
+            if events is not None : events.append(("open", best.state, best.pathCost))
+
+            result, fCost = RBFS(problem, best, min(flimit, alternative))
             if result is not None:
-                print("RESULTING")
+                best.fCost = fCost
+                if verbose : print("RESULTING")
                 return result, best.fCost
+            children.backup(fCost)
+            if events is not None : events.append(("backup", best.state, best.fCost))
 
     initialNode = Node(problem.initial)
     initialNode.fCost = hCost(initialNode)
-    romaniaMap.updateState(initialNode.state, "start")
-    romaniaMap.mainNodeText = f"Starting Node : {initialNode.state}"
-
-    if runVisualization : time.sleep(waitingStart)
+    if events is not None : events.append(("start", initialNode.state, initialNode.fCost))
 
     result, bestf = RBFS(problem, initialNode, np.inf)
+    if verbose and pruneCycles : print(f"\nPruned children (already on the path): {prunedChildren}")
 
     if result is None:
-        print("\nNo solution found")
+        if verbose : print("\nNo solution found")
+        return None
 
-    romaniaMap.updateState(result.state, "goal")
-    romaniaMap.mainNodeText = f"Reached Goal Node : {result.state}"
+    if events is not None : events.append(("goal", result.state, result.pathCost))
 
-    solution = result.solution()
-    print(f"\nPATH from {startNode} to {endNode}")
-    for node in solution:
-        print(node, end = " -> ")
+    if verbose:
+        print(f"\nPATH from {problem.stateName(problem.initial)} to {problem.stateName(problem.goal)}")
+        for city in result.solution(problem):
+            print(city, end = " -> ")
     return result
 
 romaniaMap = UndirectedGraph(dict(
@@ -120,125 +147,30 @@ print("ADJACENCY DATA\n", adjacencyData)
 startNode = 'Arad'
 endNode = 'Hirsova'
 romaniaProblem = GraphProblem(startNode, endNode, romaniaMap)
+if compileGraph : romaniaProblem = romaniaProblem.compile()
 
 import threading
 
-def runRBFSasThread(problem, hFunc=None):
-    thread = threading.Thread(target=RecursiveBestFirstSearch, args=(problem, hFunc))
+def runRBFSasThread(problem, hFunc=None, visitedNodes=None, events=None):
+    thread = threading.Thread(target=RecursiveBestFirstSearch, args=(problem, hFunc, visitedNodes, pruneCycles, events, genVerbose))
     thread.start()
     return thread
 
-import pandas as py, pygame, matplotlib.pyplot as plt, time
 mapForVisualization = romaniaMap.map
 
 print(mapForVisualization)
-def playVisualization():
-        pygame.init()
-
-        # Define colors
-        red = (255, 0, 0)
-        green = (0, 255, 0)
-        blue = (0, 0, 255)
-        black = (0, 0, 0)
-        gray = (200, 200, 200)
-        white = (255, 255, 255)
-        pink = (235, 50, 180)
-        orange = (245, 115, 0)
-        purple = (128, 0, 128)
-        
-        font = pygame.font.Font(None, 36)
-        titleText = font.render(f"{startNode}'s Map", True, black)
-        mainNodeInfo = font.render("Visited Node:", True, black)
-        currentPathCostText = font.render("Current Path Cost:", True, black)
-
-        # Set the width and height of the screen
-        screenWidth = 1200
-        screenHeight = 800
-        screen = pygame.display.set_mode((screenWidth, screenHeight))
-        pygame.display.set_caption(f"{startNode} Map Visualization")
-
-        textWidth = titleText.get_width()
-        textHeight = titleText.get_height()
-        
-        screenWidth *= .9
-        screenHeight *= .9
-
-        scaledMap = mapForVisualization.copy()
-        # Scale the latitude and longitude values to fit the screen
-        min_lat = mapForVisualization['lat'].min()
-        max_lat = mapForVisualization['lat'].max()
-        min_lng = mapForVisualization['lng'].min()
-        max_lng = mapForVisualization['lng'].max()
-
-        scaled_lat = (mapForVisualization['lat'] - min_lat) / (max_lat - min_lat) * screenHeight
-        scaled_lng = (mapForVisualization['lng'] - min_lng) / (max_lng - min_lng) * screenWidth
-        scaled_lat = screenHeight - scaled_lat
-
-        scaledMap['lat'] = scaled_lat
-        scaledMap['lng'] = scaled_lng
-        # Game loop
-        running = True
-
-        while running:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-            # Clear the screen
-            screen.fill(white)
-            
-            # Draw the lines (connecting edges) between all the states on the map
-            for origin, destinations in adjacencyData.items():
-                originData = scaledMap[scaledMap['city'] == origin]
-                xValue = originData['lng'].values[0] + screenWidth/10
-                yValue = originData['lat'].values[0] + screenHeight/10
-                originCoords = (int(xValue), int(yValue))
-
-                for destination in destinations:
-                    destinationData = scaledMap[scaledMap['city'] == destination[0]]
-                    destXValue = destinationData['lng'].values[0] + screenWidth/10
-                    destYValue =destinationData['lat'].values[0] + screenHeight/10
-                    destinationCoords = (int(destXValue), int(destYValue))
-                    pygame.draw.line(screen, black, originCoords, destinationCoords, 4)
-
-            # Draw the points
-            for lat, lng, state in zip(scaled_lat + screenHeight/10, scaled_lng + screenWidth/10, mapForVisualization['state']):
-                match (state):
-                    case "open":
-                        color = red
-                    case "closed":
-                        color = black
-                    case "frontier":
-                        color = green
-                    case "start":
-                        color = pink
-                    case "goal":
-                        color = orange
-                    case "alternative":
-                        color = purple
-                    case _:
-                        color = gray
-                pygame.draw.circle(screen, color, (int(lng), int(lat)), 8)
-
-            # Update the screen
-            textX = (screenWidth - textWidth) // 2
-            textY = 20
-            screen.blit(titleText, (textX, textY))
-
-            textY = 40
-            screen.blit(mainNodeInfo, (40, textY))
-            mainNodeInfo = font.render((romaniaMap.mainNodeText), True, black)
-
-            textY = screenHeight
-            screen.blit(currentPathCostText, (40, textY))
-            currentPathCostText = font.render("Current Path Cost: " + str(romaniaMap.maxPath), True, black)
-            
-            pygame.display.flip()
-        pygame.quit()
-
-result = runRBFSasThread(romaniaProblem, None)
-playVisualization()
+from MapRenderer import MapRenderer
+# the positions of the cities and roads are projected once, and the renderer replays the recorded search events at most 30 frames per second
+def playVisualization(events, problem):
+    edges = [(origin, destination[0]) for origin, destinations in adjacencyData.items() for destination in destinations]
+    renderer = MapRenderer(mapForVisualization['city'], mapForVisualization['lat'], mapForVisualization['lng'], edges, startNode)
+    player = SearchEventPlayer(events, renderer, problem.stateName, {"start": waitingStart, "expand": waitingParent, "reset": waitingComplete})
+    renderer.run(player.update)
+
+# the search only records events when there is a visualization to replay them
+searchEvents = SearchEventBuffer() if runVisualization else None
+result = runRBFSasThread(romaniaProblem, None, allVisitedNodes, searchEvents)
+if runVisualization : playVisualization(searchEvents, romaniaProblem)
 # result = RecursiveBestFirstSearch(romaniaProblem).solution()
 
 print("\n\nAll Visited Nodes: ", allVisitedNodes, sep = "")
@@ -0,0 +1,133 @@
+from PriorityQueue import IndexedPriorityQueue
+from utils import distance
+import numpy as np
+
+
+class DStarLite:
+    """D* Lite (Koenig and Likhachev, 2002) incremental planner on the Graph of a GraphProblem.
+    It searches backwards, from the goal to the start: g[s] is the cost from s to the goal found so
+    far and rhs[s] the one-step lookahead min(cost(s, s') + g[s']), and only the states where they
+    differ (inconsistent) are in the queue. When a link changes only its origin is updated, so the
+    next route repairs the part of the search the change affects instead of searching from scratch.
+    The start can move along the route (moveTo), km keeps the old keys valid without rebuilding the queue.
+    hCost(a, b): consistent estimate of the cost from a to b, by default the straight-line distance of
+    graph.locations (or 0 without locations).
+    With subscribe, the planner listens to graph.subscribe, so every connect/connect1 is repaired on
+    the next route; watch(callback) also replans right after each change and calls callback(route)
+    when the route changes (route is (path, cost), or None when the goal can not be reached)."""
+
+    def __init__(self, problem, hCost=None, subscribe=True):
+        self.problem = problem
+        self.graph = problem.graph
+        locations = getattr(self.graph, 'locations', None)
+        self.hCost = hCost or ((lambda a, b: int(distance(locations[a], locations[b]))) if locations else (lambda a, b: 0))
+        self.start = self.last = problem.initial
+        self.goal = problem.goal
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.km = 0
+        self.queue = IndexedPriorityQueue()
+        self.queue.push(self.goal, self.key(self.goal))
+        # predecessors[s]: states with a link to s, the ones whose rhs can change when g[s] changes
+        self.predecessors = {}
+        for A, links in self.graph.graph_dict.items():
+            for B in links:
+                self.predecessors.setdefault(B, set()).add(A)
+        self.watchers = []
+        self.currentRoute = None
+        self.expandedNodes = 0
+        self.updatedNodes = 0
+        self.subscribed = subscribe
+        if subscribe : self.graph.subscribe(self.edgeChanged)
+
+    def cost(self, A, B):
+        length = self.graph.graph_dict.get(A, {}).get(B)
+        return np.inf if length is None else length
+
+    def key(self, state):
+        best = min(self.g.get(state, np.inf), self.rhs.get(state, np.inf))
+        return (best + self.hCost(self.start, state) + self.km, best)
+
+    def updateNode(self, state):
+        """Recomputes the rhs of state from its successors, and puts it in the queue only if it is inconsistent."""
+        self.updatedNodes += 1
+        if state != self.goal:
+            self.rhs[state] = min((length + self.g.get(successor, np.inf) for successor, length in self.graph.graph_dict.get(state, {}).items() if length is not None), default=np.inf)
+        if state in self.queue:
+            self.queue.remove(state)
+        if self.g.get(state, np.inf) != self.rhs.get(state, np.inf):
+            self.queue.push(state, self.key(state))
+
+    def computeShortestPath(self):
+        """Expands the inconsistent states until the start is consistent and no key in the queue is lower than its key."""
+        g, rhs, queue = self.g, self.rhs, self.queue
+        while queue and (queue.peek()[1] < self.key(self.start) or rhs.get(self.start, np.inf) != g.get(self.start, np.inf)):
+            state, oldKey = queue.pop()
+            newKey = self.key(state)
+            if oldKey < newKey:
+                queue.push(state, newKey) # the key is old (km or h changed since it was pushed)
+                continue
+            self.expandedNodes += 1
+            if g.get(state, np.inf) > rhs.get(state, np.inf):
+                g[state] = rhs[state]
+                for predecessor in self.predecessors.get(state, ()):
+                    self.updateNode(predecessor)
+            else:
+                g[state] = np.inf
+                self.updateNode(state)
+                for predecessor in self.predecessors.get(state, ()):
+                    self.updateNode(predecessor)
+
+    def edgeChanged(self, A, B, oldDistance, distance):
+        """Graph listener: the cost of the link from A to B changed from oldDistance to distance
+        (on an undirected graph, the link from B to A too)."""
+        self.predecessors.setdefault(B, set()).add(A)
+        self.updateNode(A)
+        if not self.graph.directed:
+            self.predecessors.setdefault(A, set()).add(B)
+            self.updateNode(B)
+        if self.watchers:
+            route = self.route()
+            if route != self.currentRoute:
+                self.currentRoute = route
+                for callback in list(self.watchers):
+                    callback(route)
+
+    def moveTo(self, state):
+        """Moves the start of the route to state (usually the next state of the route, once the agent gets there)."""
+        self.km += self.hCost(self.last, state)
+        self.start = self.last = state
+
+    def route(self):
+        """Returns the (path, cost) of the cheapest route from the start to the goal, or None if there is none, replanning only what changed.
+        The path follows the cheapest successors, a simple path has at most one hop less than the graph has nodes,
+        so if the walk takes more than that (g left inconsistent, the successors cycle) it returns None instead of looping forever."""
+        self.computeShortestPath()
+        cost = self.g.get(self.start, np.inf)
+        if cost == np.inf:
+            return None
+        path = [self.start]
+        maxHops = len(self.graph.nodes()) - 1
+        while path[-1] != self.goal:
+            state = path[-1]
+            successors = self.graph.graph_dict.get(state, {})
+            if not successors or len(path) > maxHops:
+                return None
+            path.append(min(successors, key=lambda successor: self.cost(state, successor) + self.g.get(successor, np.inf)))
+        return path, cost
+
+    def watch(self, callback):
+        """Calls callback(route) every time a change of the graph changes the route, until unwatch."""
+        if not self.subscribed:
+            raise ValueError("the planner is not subscribed to its graph")
+        self.currentRoute = self.route()
+        self.watchers.append(callback)
+
+    def unwatch(self, callback):
+        self.watchers.remove(callback)
+
+    def close(self):
+        """Stops listening to the graph (the planner will not see its later changes)."""
+        if self.subscribed:
+            self.graph.unsubscribe(self.edgeChanged)
+            self.subscribed = False
@@ -1,5 +1,6 @@
 from Problem import Problem
 from utils import distance
+from CompiledGraph import CompiledGraph # shared with RBFS, the scripts and tests put its directory on the path (after this one)
 import numpy as np
 
 class GraphProblem(Problem):
@@ -40,3 +41,50 @@ class GraphProblem(Problem):
         else:
             return np.inf
 
+
+    def stateName(self, state):
+        return state
+
+    def compile(self):
+        """Return a CompiledGraphProblem with the same initial, goal and graph, whose states are integer ids
+        (so its solutions are named with node.solution(problem))."""
+        return CompiledGraphProblem(self.initial, self.goal, self.graph)
+
+
+class CompiledGraphProblem(GraphProblem):
+    """The same problem as GraphProblem, but the graph_dict is compiled once into
+    CSR arrays (see CompiledGraph), so states are integer node ids and actions are
+    (neighborId, cost) pairs, which carry the cost of their edge to pathCost."""
+
+    def __init__(self, initial, goal, graph):
+        self.compiled = CompiledGraph.fromGraphDict(graph.graph_dict)
+        super().__init__(self.compiled.id(initial), self.compiled.id(goal), graph)
+        locs = getattr(graph, 'locations', None)
+        self.locations = None
+        if locs:
+            self.locations = np.array([locs[name] for name in self.compiled.names], dtype=np.float64)
+
+    def actions(self, A):
+        """The actions at a graph node are the (id, cost) of its neighbors."""
+        neighbors, weights = self.compiled.neighborsOf(A)
+        return list(zip(neighbors.tolist(), weights.tolist()))
+
+    def result(self, state, action):
+        return action[0]
+
+    def pathCost(self, cost_so_far, A, action, B):
+        return cost_so_far + action[1]
+
+    def find_min_edge(self):
+        """Find minimum value of edges."""
+        return self.compiled.weights.min() if self.compiled.edgeCount() else np.inf
+
+    def hCost(self, node):
+        """hCost function is straight-line distance from a node's state to goal."""
+        if self.locations is None:
+            return np.inf
+        state = node if type(node) is int else node.state
+        return int(distance(self.locations[state], self.locations[self.goal]))
+
+    def stateName(self, state):
+        return self.compiled.names[state]
@@ -1,9 +1,13 @@
 class Node:
+    # slots instead of a __dict__ per node, hCost is only set when it is memoized (see utils.memoize)
+    __slots__ = ("state", "parent", "action", "pathCost", "depth", "fCost", "hCost")
+
     def __init__(self, state, parent=None, action=None, pathCost=0):
         self.state = state
         self.parent = parent
         self.action = action
         self.pathCost = pathCost
+        self.fCost = 0
         self.depth = 0
         if parent:
             self.depth = parent.depth + 1
@@ -23,8 +27,16 @@ class Node:
         nextNode = Node(nextState, self, action, problem.pathCost(self.pathCost, self.state, action, nextState))
         return nextNode
 
-    def solution(self):
-        return [node.action for node in self.path()[1:]]
+    def solution(self, problem=None):
+        """Names of the cities from the root to this node (without the root), collected in one walk up the parents (without building the path of nodes).
+        The actions of a GraphProblem are these names already, a CompiledGraphProblem's are (id, cost) pairs, so with a problem
+        every state is named by problem.stateName instead (and the solution is the same for both problems)."""
+        actions = [None] * self.depth
+        node = self
+        while node.parent is not None:
+            actions[node.depth - 1] = node.action if problem is None else problem.stateName(node.state)
+            node = node.parent
+        return actions
 
     def path(self):
         node, path_back = self, []
@@ -0,0 +1,164 @@
+from Node import Node
+from collections import deque
+import heapq, itertools, numpy as np
+
+class SMAStarEntry:
+    """A node kept in the memory of SMA*, with the bookkeeping to forget and regenerate its successors.
+    pendingActions: actions whose successor was never generated,
+    forgotten: backed up fCost of every forgotten successor, keyed by its action."""
+
+    def __init__(self, node, parent=None, fCost=0):
+        self.node = node
+        self.parent = parent
+        self.fCost = fCost
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.pendingActions = None # filled the first time the entry is chosen
+        self.children = []
+        self.forgotten = {}
+        self.inOpen = False
+        self.version = 0
+
+    def generatedAll(self):
+        return self.pendingActions is not None and not self.pendingActions
+
+    def __repr__(self):
+        return "<SMAStarEntry {} f={}>".format(self.node.state, self.fCost)
+
+
+class SMAStar:
+    """Simplified Memory-bounded A* (Russell, 1992) on the same Problem/Node interfaces as GraphProblem.
+    It works as A* while at most maxNodes nodes are in memory. When the memory is full, it forgets the
+    shallowest leaf with the highest fCost, and keeps that fCost in the leaf's parent, so the subtree is
+    only generated again when it is the best option left. With a big maxNodes it expands like A* and with
+    a small one it uses little memory and regenerates more (like RBFS); the answer is optimal whenever the
+    optimal path fits in maxNodes nodes (its depth is smaller than maxNodes).
+    The search returns the goal Node (with its path and pathCost), or None if there is no reachable solution."""
+
+    def __init__(self, problem, hCost=None, maxNodes=1000):
+        if maxNodes < 2:
+            raise ValueError("SMA* needs memory for at least two nodes")
+        self.problem = problem
+        self.hCost = hCost or problem.hCost
+        self.maxNodes = maxNodes
+        self.open = [] # (fCost, -depth, tie, version, entry), lowest fCost and deepest first
+        self.leaves = [] # (-fCost, depth, tie, version, entry), highest fCost and shallowest first
+        self.tie = itertools.count()
+        self.nodesInMemory = 0
+        self.maxNodesInMemory = 0
+        self.expandedNodes = 0
+        self.generatedNodes = 0
+        self.forgottenNodes = 0
+
+    def push(self, entry):
+        """(Re)inserts entry in OPEN with its current fCost, the older copies in the heaps become stale."""
+        entry.inOpen = True
+        entry.version += 1
+        tie = next(self.tie)
+        heapq.heappush(self.open, (entry.fCost, -entry.depth, tie, entry.version, entry))
+        if not entry.children:
+            heapq.heappush(self.leaves, (-entry.fCost, entry.depth, tie, entry.version, entry))
+
+    def best(self):
+        while self.open:
+            entry = self.open[0][4]
+            if entry.inOpen and entry.version == self.open[0][3]:
+                return entry
+            heapq.heappop(self.open)
+        return None
+
+    def worstLeaf(self, exclude):
+        """Shallowest leaf of OPEN with the highest fCost (other than exclude and the root), or None."""
+        skipped = []
+        worst = None
+        while self.leaves:
+            item = heapq.heappop(self.leaves)
+            entry = item[4]
+            if not entry.inOpen or entry.version != item[3] or entry.children:
+                continue # stale, it is pushed again when it changes
+            if entry is exclude or entry.parent is None:
+                skipped.append(item)
+                continue
+            worst = entry
+            break
+        for item in skipped:
+            heapq.heappush(self.leaves, item)
+        return worst
+
+    def backup(self, entry):
+        """Once all the successors of entry were generated, its fCost is the lowest fCost of its successors (in memory or forgotten), and the change goes up to its ancestors."""
+        while entry is not None and entry.generatedAll():
+            fCost = min(itertools.chain((child.fCost for child in entry.children), entry.forgotten.values()), default=np.inf)
+            if fCost == entry.fCost:
+                return
+            entry.fCost = entry.node.fCost = fCost
+            if entry.inOpen : self.push(entry)
+            entry = entry.parent
+
+    def forget(self, entry):
+        """Drops the leaf entry from memory, its parent remembers its fCost and goes back to OPEN to regenerate it when it is needed."""
+        parent = entry.parent
+        parent.children.remove(entry)
+        parent.forgotten[entry.node.action] = entry.fCost
+        entry.inOpen = False
+        self.nodesInMemory -= 1
+        self.forgottenNodes += 1
+        self.push(parent)
+
+    def search(self):
+        problem = self.problem
+        root = SMAStarEntry(Node(problem.initial))
+        root.fCost = root.node.fCost = self.hCost(root.node)
+        self.push(root)
+        self.nodesInMemory = self.maxNodesInMemory = 1
+
+        while True:
+            best = self.best()
+            if best is None or best.fCost == np.inf:
+                return None
+            if problem.goal_test(best.node.state):
+                return best.node
+
+            if best.pendingActions is None:
+                best.pendingActions = deque(problem.actions(best.node.state))
+                self.expandedNodes += 1
+                if not best.pendingActions: # dead end, it stays in OPEN (as a leaf to forget) with an infinite fCost
+                    best.fCost = best.node.fCost = np.inf
+                    self.push(best)
+                    self.backup(best.parent)
+                    continue
+
+            # the successors never generated go first, then the forgotten one with the lowest fCost
+            if best.pendingActions:
+                action, forgottenFCost = best.pendingActions.popleft(), -np.inf
+            else:
+                action = min(best.forgotten, key=best.forgotten.get)
+                forgottenFCost = best.forgotten.pop(action)
+            childNode = best.node.child_node(problem, action)
+            self.generatedNodes += 1
+            if not problem.goal_test(childNode.state) and best.depth + 2 >= self.maxNodes:
+                fCost = np.inf # the path to it fills the whole memory, so it can not go any deeper
+            else:
+                fCost = max(best.fCost, childNode.pathCost + self.hCost(childNode), forgottenFCost)
+            childNode.fCost = fCost
+            child = SMAStarEntry(childNode, best, fCost)
+            best.children.append(child)
+
+            if best.generatedAll():
+                self.backup(best)
+            if best.generatedAll() and not best.forgotten:
+                best.inOpen = False # all its successors are in memory
+            elif best.inOpen:
+                self.push(best) # it stops being a leaf
+
+            if self.nodesInMemory >= self.maxNodes:
+                worst = self.worstLeaf(best)
+                if worst is not None : self.forget(worst)
+
+            self.push(child)
+            self.nodesInMemory += 1
+            self.maxNodesInMemory = max(self.maxNodesInMemory, self.nodesInMemory)
+
+
+def SMAStarSearch(problem, hCost=None, maxNodes=1000):
+    """Runs SMA* with memory for maxNodes nodes, and returns the goal Node or None (see SMAStar)."""
+    return SMAStar(problem, hCost, maxNodes).search()
@@ -10,11 +10,17 @@ class Graph:
     inverse link is also added. You can use g.nodes() to get a list of nodes,
     g.get('A') to get a dict of links out of A, and g.get('A', 'B') to get the
     length of the link from A to B. 'Lengths' can actually be any object at
-    all, and nodes can be any hashable object."""
+    all, and nodes can be any hashable object.
+    g.subscribe(listener) calls listener(A, B, oldDistance, distance) every time
+    connect/connect1 change the length of a link (oldDistance is None for a new
+    one), so planners like DStarLite can repair their routes. On an undirected
+    graph connect sets both links before it notifies, once, so listeners never
+    see only one direction updated."""
 
     def __init__(self, graph_dict=None, directed=True):
         self.graph_dict = graph_dict or {}
         self.directed = directed
+        self.listeners = []
         self.maxPath = 0
         self.mainNodeText = ""
         if not directed:
@@ -66,13 +72,37 @@ class Graph:
     def connect(self, A, B, distance=1):
         """Add a link from A and B of given distance, and also add the inverse
         link if the graph is undirected."""
-        self.connect1(A, B, distance)
-        if not self.directed:
-            self.connect1(B, A, distance)
+        if self.directed:
+            self.connect1(A, B, distance)
+            return
+        oldDistance = self.get(A, B)
+        changed = self.connect1(A, B, distance, notify=False)
+        changed = self.connect1(B, A, distance, notify=False) or changed
+        if changed:
+            self.notify(A, B, oldDistance, distance)
 
-    def connect1(self, A, B, distance):
-        """Add a link from A to B of given distance, in one direction only."""
-        self.graph_dict.setdefault(A, {})[B] = distance
+    def connect1(self, A, B, distance, notify=True):
+        """Add a link from A to B of given distance, in one direction only.
+        Return True if the length of the link changed."""
+        links = self.graph_dict.setdefault(A, {})
+        oldDistance = links.get(B)
+        links[B] = distance
+        if oldDistance == distance:
+            return False
+        if notify:
+            self.notify(A, B, oldDistance, distance)
+        return True
+
+    def notify(self, A, B, oldDistance, distance):
+        for listener in list(self.listeners):
+            listener(A, B, oldDistance, distance)
+
+    def subscribe(self, listener):
+        """Call listener(A, B, oldDistance, distance) after every change of a link."""
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
 
     def nodes(self):
         """Return a list of nodes in the graph."""
@@ -2,7 +2,7 @@ import pandas as pd
 import unicodedata
 import pandas as py, pygame, matplotlib.pyplot as plt, time
 pd.options.mode.chained_assignment = None
-import threading
+import threading, numpy as np
 
 # self.worldCities, contains the information of the cities of the world
 
@@ -26,6 +26,15 @@ class Map():
         self.map = self.createCountryDF(countryName)
         self.cleanupSpecialCharacters()
         self.changeCitiesPerState(citiesPerState)
+        self.buildCoordinateIndex()
+
+    # self.coordinates is a contiguous (n, 2) float64 array with the [lat, lng] of every row of self.map, and self.cityRows maps each city name to its row
+    # they are used by the distance queries, so they do not have to filter the whole DataFrame on every heuristic call
+    def buildCoordinateIndex(self):
+        self.coordinates = np.ascontiguousarray(self.map[['lat', 'lng']].to_numpy(dtype=np.float64))
+        self.cityRows = {}
+        for row, city in enumerate(self.map['city']):
+            self.cityRows.setdefault(city, row) # keeps the first row, as the DataFrame filters did
     
     def cleanupSpecialCharacters(self):
         self.map['city'] = self.map['city'].apply(lambda x: unicodedata.normalize('NFKD', x).encode('ASCII', 'ignore').decode('utf-8'))
@@ -50,21 +59,22 @@ class Map():
         self.map['state'].loc[self.map['city'] == city] = state
     
     def getCoordinates (self, city):
-        city = self.map.loc[self.map['city'] == city]
-        return (city['lat'].values[0], city['lng'].values[0])
+        lat, lng = self.coordinates[self.cityRows[city]]
+        return (lat, lng)
     
     def getEuclideanDistance(self, city1Name, city2Name):
-        city1 = self.map.loc[self.map['city'] == city1Name]
-        city2 = self.map.loc[self.map['city'] == city2Name]
-
-        lat1 = city1['lat'].values[0]
-        lng1 = city1['lng'].values[0]
-        lat2 = city2['lat'].values[0]
-        lng2 = city2['lng'].values[0]
+        lat1, lng1 = self.coordinates[self.cityRows[city1Name]]
+        lat2, lng2 = self.coordinates[self.cityRows[city2Name]]
         distance = ((lat1 - lat2)**2 + (lng1 - lng2)**2) * 100
         distance = round(distance, 2)
 
         return distance
+
+    def distances_to(self, goal, names) -> np.ndarray:
+        """Returns the getEuclideanDistance of every city in names to goal, computed in a single NumPy call."""
+        rows = np.fromiter((self.cityRows[name] for name in names), dtype=np.int64)
+        difference = self.coordinates[rows] - self.coordinates[self.cityRows[goal]]
+        return np.round((difference ** 2).sum(axis=1) * 100, 2)
     
     def playVisualization(self, sleepTime = 2):
         pygame.init()
@@ -1,6 +1,10 @@
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
+import os, sys
+# the modules shared with RBFS (MapRenderer) are imported from its directory, which goes after this one, so the Node, State, Problem and Map of this directory are still the ones found
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "RBFS"))
+
 from Node import Node
 from State import State
 from Problem import MapProblem
@@ -127,107 +131,18 @@ def run_RBFS_as_thread(problem, hFunc=None):
 
 import pandas as py, pygame, matplotlib.pyplot as plt, time
 mapForVisualization = mexicoMap.map
-def playVisualization(sleepTime = 2):
-        pygame.init()
-
-        # Define colors
-        red = (255, 0, 0)
-        green = (0, 255, 0)
-        blue = (0, 0, 255)
-        black = (0, 0, 0)
-        gray = (200, 200, 200)
-        white = (255, 255, 255)
-        pink = (235, 50, 180)
-        orange = (245, 115, 0)
-        
-        font = pygame.font.Font(None, 36)
-        titleText = font.render(f"{countryName}'s Map", True, black)
-        currentVisitedNode = font.render("Visited Node:", True, black)
-        currentPathCostText = font.render("Current Path Cost:", True, black)
-
-        # Set the width and height of the screen
-        screenWidth = 1200
-        screenHeight = 800
-        screen = pygame.display.set_mode((screenWidth, screenHeight))
-        pygame.display.set_caption(f"{countryName} Map Visualization")
-
-        textWidth = titleText.get_width()
-        textHeight = titleText.get_height()
-        
-        screenWidth *= .9
-        screenHeight *= .9
-
-        scaledMap = mapForVisualization.copy()
-        # Scale the latitude and longitude values to fit the screen
-        min_lat = mapForVisualization['lat'].min()
-        max_lat = mapForVisualization['lat'].max()
-        min_lng = mapForVisualization['lng'].min()
-        max_lng = mapForVisualization['lng'].max()
-
-        scaled_lat = (mapForVisualization['lat'] - min_lat) / (max_lat - min_lat) * screenHeight
-        scaled_lng = (mapForVisualization['lng'] - min_lng) / (max_lng - min_lng) * screenWidth
-        scaled_lat = screenHeight - scaled_lat
-
-        scaledMap['lat'] = scaled_lat
-        scaledMap['lng'] = scaled_lng
-        # Game loop
-        running = True
-
-        while running:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-            # Clear the screen
-            screen.fill(white)
-            
-            # Draw the lines (connecting edges) between all the states on the map
-            for origin, destinations in adjacencyData.items():
-                originData = scaledMap[scaledMap['city'] == origin]
-                xValue = originData['lng'].values[0] + screenWidth/10
-                yValue = originData['lat'].values[0] + screenHeight/10
-                originCoords = (int(xValue), int(yValue))
-
-                for destination in destinations:
-                    destinationData = scaledMap[scaledMap['city'] == destination[0]]
-                    destXValue = destinationData['lng'].values[0] + screenWidth/10
-                    destYValue =destinationData['lat'].values[0] + screenHeight/10
-                    destinationCoords = (int(destXValue), int(destYValue))
-                    pygame.draw.line(screen, black, originCoords, destinationCoords, 4)
-
-            # Draw the points
-            for lat, lng, state in zip(scaled_lat + screenHeight/10, scaled_lng + screenWidth/10, mapForVisualization['state']):
-                match (state):
-                    case "open":
-                        color = red
-                    case "closed":
-                        color = black
-                    case "frontier":
-                        color = green
-                    case "start":
-                        color = pink
-                    case "goal":
-                        color = orange
-                    case _:
-                        color = gray
-                pygame.draw.circle(screen, color, (int(lng), int(lat)), 8)
-
-            # Update the screen
-            textX = (screenWidth - textWidth) // 2
-            textY = 20
-            screen.blit(titleText, (textX, textY))
-
-            textY = 40
-            screen.blit(currentVisitedNode, (40, textY))
-            currentVisitedNode = font.render("Visited Node: " + str(mexicoMap.currentVisitedNode), True, black)
-
-            textY = screenHeight - 40
-            screen.blit(currentPathCostText, (40, textY))
-            currentPathCostText = font.render("Current Path Cost: " + str(mexicoMap.maxPath), True, black)
-            
-            pygame.display.flip()
-        pygame.quit()
+from MapRenderer import MapRenderer
+# the positions of the cities and roads are projected once, and every frame (at most 30 per second) copies the states the search wrote on the map
+def playVisualization():
+    edges = [(origin, destination[0]) for origin, destinations in adjacencyData.items() for destination in destinations]
+    renderer = MapRenderer(mapForVisualization['city'], mapForVisualization['lat'], mapForVisualization['lng'], edges, countryName)
+
+    def onFrame():
+        renderer.setStates(mapForVisualization['state'])
+        renderer.currentVisitedNode = mexicoMap.currentVisitedNode
+        renderer.maxPath = mexicoMap.maxPath
+
+    renderer.run(onFrame)
 
 resultMexico1Node = run_RBFS_as_thread(mexico1Node, None)
 if runVisualization : playVisualization()
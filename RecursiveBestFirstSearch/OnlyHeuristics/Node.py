@@ -2,6 +2,8 @@ from State import State
 from Problem import GraphProblem
 
 class Node:
+    __slots__ = ("parent", "fCost", "hCost", "state", "action")
+
     def __init__(self, state : State, fCost = 0, parent = None, action = None):
         self.parent = parent
         self.fCost = fCost
@@ -14,15 +16,13 @@ class Node:
     def getSolution(self):
         if self.parent == None:
             return "The initial node was the node Goal, no actions were taken"
-        nodesPath = [node.action for node in self.path()[1:]]
-        displayString = ""
-        for i in range(len(nodesPath)):
-            if i == len(nodesPath)-1:
-                displayString += nodesPath[i]
-                return displayString
-            displayString += nodesPath[i] + " -> "
-        
-        return displayString
+        actions = []
+        node = self
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        return " -> ".join(actions)
 
     def expand(self, problem : GraphProblem, verbose = False):
         children = []
@@ -0,0 +1,45 @@
+from Node import Node
+from SearchContext import SearchContext
+from SearchEvents import SearchEventBuffer
+from SuccessorCache import SuccessorCache
+from PriorityQueue import IndexedPriorityQueue
+import itertools, numpy as np
+
+# A* on the same problems, hCost functions, results and stats as the RBFS of SearchContext, to compare them on the same queries
+# The frontier is an IndexedPriorityQueue of states, so a state reached again with a lower pathCost moves up (decrease key) instead of being added twice
+# bestCosts keeps the lowest pathCost found to every state reached, and a closed state reached with a lower pathCost is opened again (the heuristic does not have to be consistent)
+# The stored nodes are the ones in the frontier, a node stops counting when it is popped (a state moved up by decrease key is still one node)
+# weight: with a weight above 1 it is weighted A* (fCost = pathCost + weight * hCost), that expands fewer nodes but its solutions can cost up to weight times the optimal
+# The states are keyed by problem.stateName, so it works with MapProblem (State objects) and CompiledMapProblem (integer ids)
+class AStarContext(SearchContext):
+    def __init__(self, problem, hFunc = None, events : SearchEventBuffer = None, weight = 1, verbose = False, nodeVerbose = False, successorCache : SuccessorCache = None):
+        super().__init__(problem, hFunc, events, False, verbose, nodeVerbose, successorCache)
+        self.hWeight = weight
+
+    def run(self, initialNode : Node) -> tuple:
+        problem, stats, events = self.problem, self.stats, self.events
+        ties = itertools.count() # same fCost: the first one reached goes first
+        frontier = IndexedPriorityQueue()
+        key = problem.stateName(initialNode.state)
+        frontier.push(key, (initialNode.fCost, next(ties)))
+        frontierNodes = {key: (initialNode, 0)}
+        bestCosts = {key: initialNode.pathCost}
+
+        while frontier:
+            key, (fCost, tie) = frontier.pop()
+            node, depth = frontierNodes.pop(key)
+            self.storeNodes(-1)
+            if depth > stats.maxDepth : stats.maxDepth = depth
+            if events is not None : events.append(("open", node.state, node.pathCost))
+            if problem.goalTest(node.state):
+                return node, fCost
+
+            for succesor in self.evaluateSuccessors(node):
+                succesorKey = problem.stateName(succesor.state)
+                if succesor.pathCost >= bestCosts.get(succesorKey, np.inf):
+                    continue
+                if succesorKey not in frontierNodes : self.storeNodes(1)
+                bestCosts[succesorKey] = succesor.pathCost
+                frontierNodes[succesorKey] = (succesor, depth + 1)
+                frontier.push(succesorKey, (succesor.fCost, next(ties)))
+        return None, np.inf
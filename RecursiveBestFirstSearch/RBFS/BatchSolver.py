@@ -0,0 +1,65 @@
+from CompiledGraph import CompiledGraph
+from CoordinateTable import CoordinateTable
+from Problem import CompiledMapProblem
+from SearchContext import SearchContext
+from State import State
+from concurrent.futures import ProcessPoolExecutor
+import os, tempfile, shutil, functools
+
+# Solves many independent (origin, goal) queries of the same map with RBFS, spread across a pool of worker processes
+# The compiled graph and the heuristic map (a CoordinateTable, or a LandmarkHeuristic) are written once to a temporary directory, and every worker memory maps them read only,
+# so no worker reads data.json nor the cities csv, nor builds a Map (the pages of the arrays are shared between all of them by the OS)
+
+# problem used by the queries of a worker process of the pool, set once by initializeWorker (solve_many passes its problem explicitly when it solves the queries itself)
+workerProblem : CompiledMapProblem = None
+
+# mapClass: class of the saved heuristic map (CoordinateTable or LandmarkHeuristic), whose load reads it back
+def initializeWorker(directory : str, mapClass = CoordinateTable):
+    global workerProblem
+    graph = CompiledGraph.load(os.path.join(directory, "graph"))
+    heuristicMap = mapClass.load(os.path.join(directory, "map"))
+    workerProblem = CompiledMapProblem(State(graph.names[0]), State(graph.names[0]), graph, heuristicMap)
+
+def solveQuery(query : tuple, withStats = False, compact = False, problem : CompiledMapProblem = None):
+    """Solves one (origin, goal) query of problem (workerProblem if it is None), returns (path, cost) where path is the list of city names from origin to goal, or None if there is no solution.
+    With compact, path is the Solution of the query instead (city ids and leg costs, solution.names(problem) gives the names), so no strings are built nor sent between processes.
+    With withStats, returns (path, cost, stats) instead, where stats is the SearchStats summary of the query (path and cost are None if there is no solution)."""
+    problem = workerProblem if problem is None else problem
+    origin, goal = query
+    context = SearchContext(problem.forQuery(State(origin), State(goal)))
+    result = context.search()
+    if result is None:
+        return (None, None, context.stats.summary()) if withStats else None
+    solution = result.extractSolution(problem, compact)
+    path = solution if compact else solution.names(problem)
+    return (path, result.pathCost, context.stats.summary()) if withStats else (path, result.pathCost)
+
+# problemTemplate: MapProblem or CompiledMapProblem with the graph and map of the queries (its own origin and goal are not used)
+# queries: list of (origin, goal) city names
+# workers: number of worker processes, None uses all the cpus, and 1 solves the queries in this process
+# returns one (path, cost) or None per query, in the same order as queries (see solveQuery for withStats and compact)
+# raises ValueError if the template has no map (the heuristic of RBFS) or a query has a city that is not on the graph, before any query is solved
+def solve_many(problemTemplate, queries : list, workers : int = None, chunksize : int = 16, withStats = False, compact = False) -> list:
+    if problemTemplate.map is None:
+        raise ValueError("The problem has no map, RBFS needs it for the heuristic, please give the problem a Map, CoordinateTable or LandmarkHeuristic.")
+    problem : CompiledMapProblem = problemTemplate.compile()
+    for query in queries:
+        for city in query:
+            if city not in problem.graph.ids:
+                raise ValueError(f"{city} of the query {query} does not exist on the problem, please change to a valid node.")
+
+    if workers == 1:
+        return [solveQuery(query, withStats, compact, problem) for query in queries]
+
+    solve = functools.partial(solveQuery, withStats=withStats, compact=compact)
+
+    directory = tempfile.mkdtemp(prefix="rbfs_")
+    try:
+        problem.graph.save(os.path.join(directory, "graph"))
+        # a Map is sent as its CoordinateTable, a CoordinateTable or LandmarkHeuristic as is (both have subset, save and load)
+        heuristicMap = getattr(problem.map, 'coordinateTable', problem.map).subset(problem.graph.names)
+        heuristicMap.save(os.path.join(directory, "map"))
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializeWorker, initargs=(directory, type(heuristicMap))) as pool:
+            return list(pool.map(solve, queries, chunksize=chunksize))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
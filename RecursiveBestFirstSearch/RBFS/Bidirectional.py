@@ -0,0 +1,105 @@
+from Node import Node
+from SearchContext import SearchContext
+from SearchEvents import SearchEventBuffer
+from SuccessorCache import SuccessorCache
+from PriorityQueue import IndexedPriorityQueue
+import itertools, numpy as np
+
+# One of the two searches of a BidirectionalContext: the best pathCost and node of every state it reached, and its frontier ordered by fCost and by pathCost
+class SearchFrontier():
+    def __init__(self, context : SearchContext, initialNode : Node):
+        self.context = context
+        self.problem = context.problem
+        key = self.problem.stateName(initialNode.state)
+        self.open = IndexedPriorityQueue() # (fCost, tie), the next node to expand
+        self.openCosts = IndexedPriorityQueue() # pathCost, its lowest one is part of the stopping bound
+        self.nodes : dict = {key: (initialNode, 0)}
+        self.bestCosts : dict = {key: initialNode.pathCost}
+        self.open.push(key, (initialNode.fCost, 0))
+        self.openCosts.push(key, initialNode.pathCost)
+
+    def lowerBound(self) -> float:
+        return self.open.peek()[1][0]
+
+    def lowestPathCost(self) -> float:
+        return self.openCosts.peek()[1]
+
+    def __len__(self):
+        return len(self.open)
+
+# Bidirectional A* on the same problems, hCost functions, results and stats as the RBFS of SearchContext
+# A forward search from the origin and a backward search from the goal (on problem.reversed(), with the hCost to the origin) are expanded by turns, always the one with the smaller frontier
+# Every time a state reached by one of them is reached by the other, the path through it is a solution, and the cheapest one found (bestCost) is kept
+# The search stops when no path left can be cheaper than bestCost, that is when bestCost is at most the largest of these lower bounds of the remaining paths:
+#   the lowest fCost of either frontier (with an admissible hCost), and the lowest pathCost of the forward frontier plus the lowest pathCost of the backward frontier
+# so stopping the first time both searches meet (which can return a longer path) is never enough
+# The hCost of the backward search is the distance from a state to the origin, so the map has to be symmetric (euclidean distances, or landmarks on an undirected graph)
+# As in AStarContext, states are keyed by problem.stateName, closed states reached with a lower pathCost are opened again, and the stored nodes are the ones in both frontiers
+class BidirectionalContext(SearchContext):
+    def __init__(self, problem, hFunc = None, events : SearchEventBuffer = None, verbose = False, nodeVerbose = False, successorCache : SuccessorCache = None):
+        super().__init__(problem, hFunc, events, False, verbose, nodeVerbose, successorCache)
+        # the backward search only borrows its own evaluateSuccessors and hCost cache, its counters go to the same stats (the successor cache is not shared, its edges are reversed)
+        self.backward = SearchContext(problem.reversed(), hFunc, None, False, verbose, nodeVerbose)
+        self.backward.stats = self.stats
+
+    def run(self, initialNode : Node) -> tuple:
+        problem = self.problem
+        if problem.goalTest(initialNode.state):
+            return initialNode, initialNode.fCost
+
+        goalNode = Node(self.backward.problem.initialState)
+        goalNode.fCost = self.hWeight * self.backward.hCostFunction(goalNode, self.nodeVerbose)
+        self.storeNodes(1)
+        forward, backward = SearchFrontier(self, initialNode), SearchFrontier(self.backward, goalNode)
+        ties = itertools.count(1)
+        bestCost, meeting = np.inf, None
+
+        while forward and backward:
+            lowerBound = max(forward.lowerBound(), backward.lowerBound(), forward.lowestPathCost() + backward.lowestPathCost())
+            if bestCost <= lowerBound:
+                break
+            side, other = (forward, backward) if len(forward) <= len(backward) else (backward, forward)
+            key, _ = side.open.pop()
+            side.openCosts.remove(key)
+            self.storeNodes(-1)
+            node, depth = side.nodes[key]
+            if depth > self.stats.maxDepth : self.stats.maxDepth = depth
+            if self.events is not None : self.events.append(("open", node.state, node.pathCost))
+
+            for succesor in side.context.evaluateSuccessors(node):
+                succesorKey = side.problem.stateName(succesor.state)
+                if succesor.pathCost >= side.bestCosts.get(succesorKey, np.inf):
+                    continue
+                if succesorKey not in side.open : self.storeNodes(1)
+                side.bestCosts[succesorKey] = succesor.pathCost
+                side.nodes[succesorKey] = (succesor, depth + 1)
+                side.open.push(succesorKey, (succesor.fCost, next(ties)))
+                side.openCosts.push(succesorKey, succesor.pathCost)
+                otherCost = other.bestCosts.get(succesorKey)
+                if otherCost is not None and succesor.pathCost + otherCost < bestCost:
+                    bestCost, meeting = succesor.pathCost + otherCost, succesorKey
+
+        if meeting is None:
+            return None, np.inf
+        return self.joinPaths(forward.nodes[meeting][0], backward.nodes[meeting][0]), bestCost
+
+    def joinPaths(self, forwardNode : Node, backwardNode : Node) -> Node:
+        """Continues the forward path of forwardNode with the states of the backward path of backwardNode (both end on the same state), and returns the goal node of the whole path.
+        Every leg is read from the stored backward nodes (the next state is the parent, and the action cost is the one of the reversed edge), so no successors are generated again."""
+        problem = self.problem
+        node = forwardNode
+        while backwardNode.parent is not None:
+            nextState = backwardNode.parent.state
+            action = self.forwardAction(node.state, nextState, backwardNode.action[1])
+            node = Node(nextState, node, action, problem.pathCost(node.pathCost, node.state, action, nextState, self.nodeVerbose))
+            backwardNode = backwardNode.parent
+        node.fCost = node.pathCost
+        return node
+
+    def forwardAction(self, state, nextState, cost):
+        """Returns the action of the problem that goes from state to nextState with that cost, the edge the backward search went through reversed."""
+        problem = self.problem
+        for action in problem.actions(state):
+            if action[1] == cost and problem.result(state, action[0]) == nextState:
+                return action
+        raise ValueError(f"There is no edge from {problem.stateName(state)} to {problem.stateName(nextState)} with a cost of {cost}, the reversed problem does not match the problem")
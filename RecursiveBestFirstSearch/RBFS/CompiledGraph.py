@@ -0,0 +1,105 @@
+import numpy as np, json, os
+
+# A CompiledGraph is a read only copy of an adjacency map stored in CSR (compressed sparse row) layout, so the search can work with integer ids instead of city names
+# names: list where names[i] is the city name of the node with id i, ids is the inverse table (name -> id)
+# offsets: the neighbors of node i are neighbors[offsets[i]:offsets[i+1]], and the cost of each of those edges is in the same positions of weights
+class CompiledGraph():
+    def __init__(self, names : list, offsets : np.ndarray, neighbors : np.ndarray, weights : np.ndarray):
+        self.names : list = names
+        self.ids : dict = {name: i for i, name in enumerate(names)}
+        self.offsets : np.ndarray = offsets
+        self.neighbors : np.ndarray = neighbors
+        self.weights : np.ndarray = weights
+
+    @classmethod
+    def fromAdjacencyMap(cls, adjacencyMap : dict):
+        """Compiles an adjacency map with the data.json layout: {city: [[neighbor, cost], ...]}."""
+        return cls.fromEdges(adjacencyMap.keys(), ((origin, action[0], action[1]) for origin, actions in adjacencyMap.items() for action in actions))
+
+    @classmethod
+    def fromGraphDict(cls, graphDict : dict):
+        """Compiles a graph_dict with the UndirectedGraph layout: {city: {neighbor: cost}}."""
+        return cls.fromEdges(graphDict.keys(), ((origin, destination, cost) for origin, links in graphDict.items() for destination, cost in links.items()))
+
+    @classmethod
+    def fromEdges(cls, names, edges):
+        """Builds the CSR arrays from (origin, destination, cost) triples, keeping the order in which the edges of every node were given."""
+        ids = {}
+        for name in names:
+            ids.setdefault(name, len(ids))
+
+        rows = {}
+        for origin, destination, cost in edges:
+            originId = ids.setdefault(origin, len(ids))
+            destinationId = ids.setdefault(destination, len(ids))
+            rows.setdefault(originId, []).append((destinationId, np.inf if cost is None else cost))
+
+        degrees = np.zeros(len(ids), dtype=np.int64)
+        for nodeId, row in rows.items():
+            degrees[nodeId] = len(row)
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+
+        neighbors = np.empty(offsets[-1], dtype=np.int64)
+        weights = np.empty(offsets[-1], dtype=np.float64)
+        for nodeId, row in rows.items():
+            start = offsets[nodeId]
+            for i, (destinationId, cost) in enumerate(row):
+                neighbors[start + i] = destinationId
+                weights[start + i] = cost
+
+        return cls(list(ids.keys()), offsets, neighbors, weights)
+
+    def __len__(self):
+        return len(self.names)
+
+    def edgeCount(self) -> int:
+        return int(self.offsets[-1])
+
+    def id(self, name) -> int:
+        return self.ids[name]
+
+    def name(self, nodeId : int):
+        return self.names[nodeId]
+
+    def degree(self, nodeId : int) -> int:
+        return int(self.offsets[nodeId + 1] - self.offsets[nodeId])
+
+    def neighborsOf(self, nodeId : int):
+        """Returns the (neighbors, weights) array views of a node, no copies are made."""
+        start, end = self.offsets[nodeId], self.offsets[nodeId + 1]
+        return self.neighbors[start:end], self.weights[start:end]
+
+    def edgeCost(self, nodeA : int, nodeB : int) -> float:
+        """Returns the cost of the edge from nodeA to nodeB, or infinity if they are not connected."""
+        neighbors, weights = self.neighborsOf(nodeA)
+        matches = np.flatnonzero(neighbors == nodeB)
+        return float(weights[matches[0]]) if len(matches) else np.inf
+
+    def reversed(self):
+        """Returns the graph with every edge reversed (the neighbors of a node are the nodes that had an edge to it), with the same ids."""
+        origins = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+        order = np.argsort(self.neighbors, kind='stable')
+        degrees = np.bincount(self.neighbors, minlength=len(self))
+        offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+        return CompiledGraph(self.names, offsets, origins[order], np.asarray(self.weights)[order])
+
+    def save(self, directory : str):
+        """Writes the CSR arrays as .npy files (and the names as json), so other processes can memory map them with load."""
+        os.makedirs(directory, exist_ok=True)
+        for arrayName in ("offsets", "neighbors", "weights"):
+            np.save(os.path.join(directory, arrayName + ".npy"), getattr(self, arrayName))
+        with open(os.path.join(directory, "names.json"), "w") as file:
+            json.dump(self.names, file)
+
+    @classmethod
+    def load(cls, directory : str, mmap = True):
+        """Loads a graph written by save, with mmap the arrays are memory mapped read only instead of copied."""
+        arrays = [np.load(os.path.join(directory, arrayName + ".npy"), mmap_mode='r' if mmap else None) for arrayName in ("offsets", "neighbors", "weights")]
+        with open(os.path.join(directory, "names.json")) as file:
+            names = json.load(file)
+        return cls(names, *arrays)
+
+    def __repr__(self):
+        return "<CompiledGraph nodes: {}, edges: {}>".format(len(self), self.edgeCount())
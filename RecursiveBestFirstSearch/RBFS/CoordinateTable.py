@@ -0,0 +1,48 @@
+import numpy as np, json, os
+
+# A CoordinateTable keeps the [lat, lng] of a list of cities in a contiguous (n, 2) float64 array, and a city name -> row dict
+# It answers the same distance queries as Map, but without pandas, so it can be saved once and loaded (memory mapped) by other processes
+class CoordinateTable():
+    def __init__(self, cities : list, coordinates : np.ndarray):
+        self.cities : list = list(cities)
+        self.coordinates : np.ndarray = coordinates
+        self.cityRows : dict = {}
+        for row, city in enumerate(self.cities):
+            self.cityRows.setdefault(city, row) # keeps the first row of repeated cities
+
+    def getCoordinates(self, city):
+        lat, lng = self.coordinates[self.cityRows[city]]
+        return (lat, lng)
+
+    def getEuclideanDistance(self, city1Name, city2Name):
+        lat1, lng1 = self.coordinates[self.cityRows[city1Name]]
+        lat2, lng2 = self.coordinates[self.cityRows[city2Name]]
+        distance = ((lat1 - lat2)**2 + (lng1 - lng2)**2) * 100
+        distance = round(distance, 2)
+
+        return distance
+
+    def distances_to(self, goal, names) -> np.ndarray:
+        """Returns the getEuclideanDistance of every city in names to goal, computed in a single NumPy call."""
+        rows = np.fromiter((self.cityRows[name] for name in names), dtype=np.int64)
+        difference = self.coordinates[rows] - self.coordinates[self.cityRows[goal]]
+        return np.round((difference ** 2).sum(axis=1) * 100, 2)
+
+    def subset(self, names : list):
+        """Returns a CoordinateTable with only the given cities, in that order (for example, aligned with the ids of a CompiledGraph)."""
+        rows = np.fromiter((self.cityRows[name] for name in names), dtype=np.int64)
+        return CoordinateTable(names, np.ascontiguousarray(self.coordinates[rows]))
+
+    def save(self, directory : str):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "coordinates.npy"), self.coordinates)
+        with open(os.path.join(directory, "cities.json"), "w") as file:
+            json.dump(self.cities, file)
+
+    @classmethod
+    def load(cls, directory : str, mmap = True):
+        """Loads a table written by save, with mmap the coordinates are memory mapped read only instead of copied."""
+        coordinates = np.load(os.path.join(directory, "coordinates.npy"), mmap_mode='r' if mmap else None)
+        with open(os.path.join(directory, "cities.json")) as file:
+            cities = json.load(file)
+        return cls(cities, coordinates)
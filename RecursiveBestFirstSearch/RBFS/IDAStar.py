@@ -0,0 +1,60 @@
+from Node import Node
+from SearchContext import SearchContext
+from SearchEvents import SearchEventBuffer
+from SuccessorCache import SuccessorCache
+import numpy as np
+
+# IDA* (iterative deepening A*) on the same problems, hCost functions, results and stats as the RBFS of SearchContext
+# Every iteration is a depth first search that only goes into nodes whose fCost is within the limit, and the next limit is the lowest fCost that went over it
+# Like RBFS it only keeps the current path (and the successors of its nodes) in memory, but it does not back up fCosts, so it expands more nodes again
+# The depth first search uses an explicit stack of [node, successors, next successor] frames, so long paths do not reach Python's recursion limit
+# and it does not go into states that are already on the current path (as the usual IDA*), otherwise a large limit lets it go around cycles until the pathCost reaches it
+class IDAStarContext(SearchContext):
+    def __init__(self, problem, hFunc = None, events : SearchEventBuffer = None, verbose = False, nodeVerbose = False, successorCache : SuccessorCache = None):
+        super().__init__(problem, hFunc, events, True, verbose, nodeVerbose, successorCache)
+
+    def run(self, initialNode : Node) -> tuple:
+        fLimit = initialNode.fCost
+        while True:
+            self.stats.iterations += 1
+            result, fLimit = self.boundedSearch(initialNode, fLimit)
+            if result is not None or fLimit == np.inf:
+                return result, fLimit
+
+    # Depth first search of the nodes whose fCost is at most fLimit, returns (goal node, fLimit) or (None, lowest fCost over fLimit)
+    def boundedSearch(self, initialNode : Node, fLimit) -> tuple:
+        nextLimit = np.inf
+        frames = [[initialNode, None, 0]]
+        pathStates = {self.problem.stateName(initialNode.state)}
+        while frames:
+            frame = frames[-1]
+            node = frame[0]
+            if frame[1] is None:
+                if len(frames) - 1 > self.stats.maxDepth : self.stats.maxDepth = len(frames) - 1
+                if self.problem.goalTest(node.state):
+                    self.releaseFrames(frames)
+                    return node, fLimit
+                frame[1] = self.evaluateSuccessors(node)
+                self.storeNodes(len(frame[1]))
+
+            successors = frame[1]
+            if frame[2] == len(successors):
+                self.storeNodes(-len(frames.pop()[1]))
+                pathStates.discard(self.problem.stateName(node.state))
+                continue
+            succesor = successors[frame[2]]
+            frame[2] += 1
+            succesorName = self.problem.stateName(succesor.state)
+            if succesorName in pathStates:
+                continue
+            if succesor.fCost > fLimit:
+                if succesor.fCost < nextLimit : nextLimit = succesor.fCost
+                continue
+            if self.events is not None : self.events.append(("open", succesor.state, succesor.pathCost))
+            pathStates.add(succesorName)
+            frames.append([succesor, None, 0])
+        return None, nextLimit
+
+    def releaseFrames(self, frames : list):
+        for frame in frames:
+            if frame[1] is not None : self.storeNodes(-len(frame[1]))
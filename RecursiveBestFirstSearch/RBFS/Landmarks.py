@@ -0,0 +1,95 @@
+from CompiledGraph import CompiledGraph
+import numpy as np, heapq, json, os
+
+# ALT (A*, Landmarks and Triangle inequality) heuristic of a CompiledGraph
+# k landmark nodes are picked once, and the road distances from every landmark to every node (and from every node to every landmark) are computed with Dijkstra
+# For any landmark L, the triangle inequality gives two lower bounds of the distance from v to the goal t:
+#   d(L, t) - d(L, v)  and  d(v, L) - d(t, L)
+# so the heuristic is the largest of them over all the landmarks (never less than 0), which never overestimates the real road distance (unlike the euclidean hCost of Map)
+# It has the same distances_to / getEuclideanDistance interface as Map and CoordinateTable, so it can be given as the map of a MapProblem or CompiledMapProblem
+# fromLandmarks[i, v] is d(landmarks[i], v) and toLandmarks[i, v] is d(v, landmarks[i]), infinity when there is no path
+# landmarks[i] is the id of the landmark node in names, or -1 when it is not one of them (a subset without it, the bounds are still valid)
+class LandmarkHeuristic():
+    def __init__(self, names : list, landmarks : np.ndarray, fromLandmarks : np.ndarray, toLandmarks : np.ndarray):
+        self.names : list = list(names)
+        self.ids : dict = {name: i for i, name in enumerate(self.names)}
+        self.landmarks : np.ndarray = landmarks
+        self.fromLandmarks : np.ndarray = fromLandmarks
+        self.toLandmarks : np.ndarray = toLandmarks
+
+    @classmethod
+    def build(cls, graph : CompiledGraph, k = 8):
+        """Picks k landmarks of graph (farthest first: every new landmark is the node farthest from the ones already picked) and computes their distance arrays."""
+        k = min(k, len(graph))
+        reverse = graph.reversed()
+        landmarks, fromLandmarks, toLandmarks = [], [], []
+        # the first landmark is the node farthest from node 0, so they all end up on the border of the graph
+        closest = dijkstra(graph, 0) if k else None
+        for _ in range(k):
+            candidates = np.where(np.isfinite(closest), closest, -1.0)
+            candidates[landmarks] = -np.inf
+            landmark = int(np.argmax(candidates))
+            landmarks.append(landmark)
+            fromLandmarks.append(dijkstra(graph, landmark))
+            toLandmarks.append(dijkstra(reverse, landmark))
+            closest = fromLandmarks[0] if len(landmarks) == 1 else np.minimum(closest, fromLandmarks[-1])
+        return cls(graph.names, np.array(landmarks, dtype=np.int64), np.array(fromLandmarks, dtype=np.float64).reshape(k, len(graph)), np.array(toLandmarks, dtype=np.float64).reshape(k, len(graph)))
+
+    def lowerBounds(self, rows : np.ndarray, goalRow : int) -> np.ndarray:
+        forward = self.fromLandmarks[:, goalRow, None] - self.fromLandmarks[:, rows]
+        backward = self.toLandmarks[:, rows] - self.toLandmarks[:, goalRow, None]
+        with np.errstate(invalid='ignore'):
+            bounds = np.fmax(forward, backward) # fmax ignores the nan of inf - inf (both nodes unreachable from the landmark, so it says nothing)
+        bounds = np.nan_to_num(bounds, nan=0.0, posinf=np.inf, neginf=0.0)
+        return bounds.max(axis=0, initial=0.0)
+
+    def distances_to(self, goal, names) -> np.ndarray:
+        """Returns the lower bound of the road distance from every city in names to goal, computed in a single NumPy call."""
+        rows = np.fromiter((self.ids[name] for name in names), dtype=np.int64)
+        return self.lowerBounds(rows, self.ids[goal])
+
+    def getEuclideanDistance(self, city1Name, city2Name):
+        """Lower bound of the road distance from city1Name to city2Name (same interface as Map.getEuclideanDistance)."""
+        return float(self.lowerBounds(np.array([self.ids[city1Name]]), self.ids[city2Name])[0])
+
+    def subset(self, names : list):
+        """Returns a LandmarkHeuristic with only the given cities, in that order (for example, aligned with the ids of a CompiledGraph), and the same landmarks."""
+        rows = np.fromiter((self.ids[name] for name in names), dtype=np.int64)
+        positions = {name: i for i, name in enumerate(names)}
+        landmarks = np.array([positions.get(self.names[landmark], -1) if landmark >= 0 else -1 for landmark in self.landmarks.tolist()], dtype=np.int64)
+        return LandmarkHeuristic(names, landmarks, np.ascontiguousarray(self.fromLandmarks[:, rows]), np.ascontiguousarray(self.toLandmarks[:, rows]))
+
+    def save(self, directory : str):
+        os.makedirs(directory, exist_ok=True)
+        for arrayName in ("landmarks", "fromLandmarks", "toLandmarks"):
+            np.save(os.path.join(directory, arrayName + ".npy"), getattr(self, arrayName))
+        with open(os.path.join(directory, "names.json"), "w") as file:
+            json.dump(self.names, file)
+
+    @classmethod
+    def load(cls, directory : str, mmap = True):
+        """Loads a heuristic written by save, with mmap the distance arrays are memory mapped read only instead of copied."""
+        arrays = [np.load(os.path.join(directory, arrayName + ".npy"), mmap_mode='r' if mmap else None) for arrayName in ("landmarks", "fromLandmarks", "toLandmarks")]
+        with open(os.path.join(directory, "names.json")) as file:
+            names = json.load(file)
+        return cls(names, *arrays)
+
+    def __repr__(self):
+        return "<LandmarkHeuristic nodes: {}, landmarks: {}>".format(len(self.names), [self.names[landmark] for landmark in self.landmarks if landmark >= 0])
+
+def dijkstra(graph : CompiledGraph, source : int) -> np.ndarray:
+    """Returns the distance from source to every node of graph (infinity for the nodes it can not reach)."""
+    offsets, neighbors, weights = graph.offsets.tolist(), graph.neighbors.tolist(), graph.weights.tolist()
+    distances = [np.inf] * len(graph)
+    distances[source] = 0.0
+    queue = [(0.0, source)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > distances[node]:
+            continue
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor, newDistance = neighbors[edge], distance + weights[edge]
+            if newDistance < distances[neighbor]:
+                distances[neighbor] = newDistance
+                heapq.heappush(queue, (newDistance, neighbor))
+    return np.array(distances, dtype=np.float64)
@@ -1,15 +1,21 @@
 import pandas as pd
 import unicodedata
-import pandas as py, pygame, matplotlib.pyplot as plt, time
+import pandas as py
 pd.options.mode.chained_assignment = None
-import threading
+import numpy as np, os, shutil
+from CoordinateTable import CoordinateTable
+import MapCache
 
-# self.worldCities, contains the information of the cities of the world
+# self.worldCities, contains the information of the cities of the world (only when the map was read from mapsFile, not from the cache)
 
+# useCache: read the country from the binary cache of mapsFile (see MapCache) instead of reading, filtering and cleaning the whole csv
+# cacheDirectory: where the cached countries are kept, by default a mapCache directory next to mapsFile
 class Map():
-    def __init__(self, countryName, citiesPerState = 1, verbose = False, mapsFile = "./RBFS/worldcities.csv"):
-        self.worldCities = py.read_csv(mapsFile, usecols=['city', 'lat', 'lng', 'country', 'admin_name'])
-        self.initialize(countryName, citiesPerState)
+    def __init__(self, countryName, citiesPerState = 1, verbose = False, mapsFile = "./RBFS/worldcities.csv", useCache = True, cacheDirectory = None):
+        if useCache:
+            self.loadCountry(mapsFile, countryName, citiesPerState, cacheDirectory)
+        else:
+            self.readCountry(mapsFile, countryName, citiesPerState)
         self.countryName = countryName
         if verbose : self.seeAllData()
         self.maxPath = 0
@@ -22,10 +28,41 @@ class Map():
         for i in range(self.map.shape[0]-1):
             print(f"State: {self.map.loc[i+1]['admin_name']}, City: {self.map.loc[i+1]['city']}")
     
+    def readCountry(self, mapsFile, countryName, citiesPerState):
+        self.worldCities = py.read_csv(mapsFile, usecols=['city', 'lat', 'lng', 'country', 'admin_name'])
+        self.initialize(countryName, citiesPerState)
+
+    # Reads the country from the binary cache of mapsFile (see MapCache) when it was built from the same csv, otherwise reads the csv and writes the cache
+    def loadCountry(self, mapsFile, countryName, citiesPerState, cacheDirectory):
+        directory = MapCache.cachePath(mapsFile, countryName, citiesPerState, cacheDirectory)
+        if os.path.isdir(directory):
+            try:
+                self.loadCache(directory, countryName)
+                return
+            except (OSError, ValueError): # incomplete or corrupted cache, it is written again
+                shutil.rmtree(directory, ignore_errors=True)
+        self.readCountry(mapsFile, countryName, citiesPerState)
+        MapCache.saveColumns(directory, self.map['city'], self.map['admin_name'], self.coordinates)
+
+    def loadCache(self, directory, countryName):
+        cities, adminNames, coordinates = MapCache.loadColumns(directory)
+        self.map = pd.DataFrame({'city': cities, 'lat': coordinates[:, 0], 'lng': coordinates[:, 1], 'country': countryName, 'admin_name': adminNames, 'state': 'closed'})
+        self.coordinateTable = CoordinateTable(cities, coordinates)
+        self.coordinates = self.coordinateTable.coordinates
+        self.cityRows = self.coordinateTable.cityRows
+
     def initialize(self, countryName, citiesPerState):
         self.map = self.createCountryDF(countryName)
         self.cleanupSpecialCharacters()
         self.changeCitiesPerState(citiesPerState)
+        self.buildCoordinateIndex()
+
+    # self.coordinateTable has a contiguous (n, 2) float64 array with the [lat, lng] of every row of self.map (self.coordinates), and maps each city name to its row (self.cityRows)
+    # it is used by the distance queries, so they do not have to filter the whole DataFrame on every heuristic call
+    def buildCoordinateIndex(self):
+        self.coordinateTable = CoordinateTable(self.map['city'], np.ascontiguousarray(self.map[['lat', 'lng']].to_numpy(dtype=np.float64)))
+        self.coordinates = self.coordinateTable.coordinates
+        self.cityRows = self.coordinateTable.cityRows
     
     def cleanupSpecialCharacters(self):
         self.map['city'] = self.map['city'].apply(lambda x: unicodedata.normalize('NFKD', x).encode('ASCII', 'ignore').decode('utf-8'))
@@ -50,23 +87,17 @@ class Map():
         self.map['state'].loc[self.map['city'] == city] = state
     
     def getCoordinates (self, city):
-        city = self.map.loc[self.map['city'] == city]
-        return (city['lat'].values[0], city['lng'].values[0])
+        return self.coordinateTable.getCoordinates(city)
     
     def getEuclideanDistance(self, city1Name, city2Name):
-        city1 = self.map.loc[self.map['city'] == city1Name]
-        city2 = self.map.loc[self.map['city'] == city2Name]
-
-        lat1 = city1['lat'].values[0]
-        lng1 = city1['lng'].values[0]
-        lat2 = city2['lat'].values[0]
-        lng2 = city2['lng'].values[0]
-        distance = ((lat1 - lat2)**2 + (lng1 - lng2)**2) * 100
-        distance = round(distance, 2)
+        return self.coordinateTable.getEuclideanDistance(city1Name, city2Name)
 
-        return distance
+    def distances_to(self, goal, names) -> np.ndarray:
+        """Returns the getEuclideanDistance of every city in names to goal, computed in a single NumPy call."""
+        return self.coordinateTable.distances_to(goal, names)
     
     def playVisualization(self, sleepTime = 2):
+        import pygame # only imported when there is something to show, so headless searches do not load it
         pygame.init()
 
         # Define colors
@@ -0,0 +1,107 @@
+import numpy as np, hashlib, os, shutil, tempfile, json, stat
+from CoordinateTable import CoordinateTable
+
+# Binary cache of the countries of a maps csv (worldcities.csv), without pandas, so headless solvers can read it without importing it
+# Every (countryName, citiesPerState) slice is written once by Map, already filtered, cleaned up and grouped, as .npy columns in its own directory
+# The name of the directory has the hash of the csv, so when the csv changes the old slice is not found (and is replaced), and nothing has to be checked by hand
+# Later runs memory map the columns, so they never parse the csv nor normalize its names again
+# The hash of the csv is kept with its (size, mtime) in a hashes.json of the cache directory, so a run only reads the whole csv again when one of them changes
+
+# Version of the files written by saveColumns, changing it invalidates every cached map
+cacheVersion = 1
+
+def defaultCacheDirectory(mapsFile : str) -> str:
+    return os.path.join(os.path.dirname(mapsFile), "mapCache")
+
+# hashes of the files already hashed by this process, fileHashes[absolute path] = (size, mtime, hash)
+fileHashes : dict = {}
+
+def fileHash(path : str, chunkSize = 1 << 20, stampDirectory : str = None) -> str:
+    """Returns the sha256 of the file at path, it is only computed when the (path, size, mtime) of the file is not known yet,
+    by this process or by the hashes.json of stampDirectory (where the new hash is written, so the next runs do not read the file either)."""
+    path = os.path.abspath(path)
+    fileStat = os.stat(path)
+    key = (fileStat.st_size, fileStat.st_mtime_ns)
+    known = fileHashes.get(path)
+    if known is not None and known[:2] == key:
+        return known[2]
+
+    stamps = readStamps(stampDirectory) if stampDirectory else {}
+    stamp = stamps.get(path)
+    if stamp is not None and tuple(stamp[:2]) == key:
+        fileHashes[path] = (*key, stamp[2])
+        return stamp[2]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunkSize), b""):
+            digest.update(chunk)
+    fileHashes[path] = (*key, digest.hexdigest())
+    if stampDirectory:
+        stamps[path] = list(fileHashes[path])
+        writeStamps(stampDirectory, stamps)
+    return digest.hexdigest()
+
+def readStamps(stampDirectory : str) -> dict:
+    try:
+        with open(os.path.join(stampDirectory, "hashes.json")) as file:
+            return json.load(file)
+    except (OSError, ValueError): # not written yet, or corrupted, the files are hashed again
+        return {}
+
+def writeStamps(stampDirectory : str, stamps : dict):
+    """Writes the hashes.json of stampDirectory (through a temporary file, so other processes never read half of it)."""
+    try:
+        os.makedirs(stampDirectory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=stampDirectory, prefix=".writing_", suffix=".json", delete=False) as file:
+            json.dump(stamps, file)
+        os.replace(file.name, os.path.join(stampDirectory, "hashes.json"))
+    except OSError: # read only directory, the hash is only kept by this process
+        pass
+
+def cachePrefix(countryName : str, citiesPerState : int) -> str:
+    return f"{countryName.replace(' ', '_').replace(os.sep, '_')}_{citiesPerState}_v{cacheVersion}_"
+
+def cachePath(mapsFile : str, countryName : str, citiesPerState : int, cacheDirectory : str = None) -> str:
+    cacheDirectory = cacheDirectory or defaultCacheDirectory(mapsFile)
+    return os.path.join(cacheDirectory, cachePrefix(countryName, citiesPerState) + fileHash(mapsFile, stampDirectory=cacheDirectory)[:16])
+
+def saveColumns(directory : str, cities, adminNames, coordinates : np.ndarray):
+    """Writes the columns of a country to directory (written in a temporary directory first, so other processes never read half a cache), and removes the caches of the same slice built from older versions of the csv."""
+    cacheDirectory = os.path.dirname(directory)
+    os.makedirs(cacheDirectory, exist_ok=True)
+    temporary = tempfile.mkdtemp(prefix=".writing_", dir=cacheDirectory)
+    try:
+        np.save(os.path.join(temporary, "city.npy"), np.asarray(cities, dtype=str))
+        np.save(os.path.join(temporary, "admin_name.npy"), np.asarray(adminNames, dtype=str))
+        np.save(os.path.join(temporary, "coordinates.npy"), np.ascontiguousarray(coordinates, dtype=np.float64))
+        os.chmod(temporary, stat.S_IMODE(os.stat(cacheDirectory).st_mode)) # mkdtemp makes it private (0700), the cache gets the permissions of the directory it is in
+        os.rename(temporary, directory)
+    except OSError: # another process wrote it first, or the directory is read only, the map is used without caching it
+        shutil.rmtree(temporary, ignore_errors=True)
+        return
+
+    prefix = os.path.basename(directory)[:-16]
+    for name in os.listdir(cacheDirectory):
+        if name.startswith(prefix) and name != os.path.basename(directory):
+            shutil.rmtree(os.path.join(cacheDirectory, name), ignore_errors=True)
+
+def loadColumns(directory : str) -> tuple[list, list, np.ndarray]:
+    """Returns the (cities, adminNames, coordinates) of a cache written by saveColumns, the coordinates are memory mapped read only."""
+    cities = np.load(os.path.join(directory, "city.npy"), mmap_mode='r')
+    adminNames = np.load(os.path.join(directory, "admin_name.npy"), mmap_mode='r')
+    coordinates = np.load(os.path.join(directory, "coordinates.npy"), mmap_mode='r')
+    if not (len(cities) == len(adminNames) == len(coordinates)):
+        raise ValueError(f"Inconsistent map cache in {directory}")
+    return cities.tolist(), adminNames.tolist(), coordinates
+
+def loadCoordinateTable(mapsFile : str, countryName : str, citiesPerState : int, cacheDirectory : str = None) -> CoordinateTable:
+    """Returns the CoordinateTable of a cached country, or None if it is not cached (a Map of the country has to be created once to write it)."""
+    directory = cachePath(mapsFile, countryName, citiesPerState, cacheDirectory)
+    if not os.path.isdir(directory):
+        return None
+    try:
+        cities, adminNames, coordinates = loadColumns(directory)
+    except (OSError, ValueError):
+        return None
+    return CoordinateTable(cities, coordinates)
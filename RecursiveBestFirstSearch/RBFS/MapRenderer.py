@@ -0,0 +1,115 @@
+import pygame, numpy as np
+
+# Colors of the cities for every visualization state
+red = (255, 0, 0)
+green = (0, 255, 0)
+black = (0, 0, 0)
+gray = (200, 200, 200)
+white = (255, 255, 255)
+pink = (235, 50, 180)
+orange = (245, 115, 0)
+purple = (128, 0, 128)
+stateColors = {"open": red, "closed": black, "frontier": green, "start": pink, "goal": orange, "alternative": purple}
+
+# Draws the cities of a map (and the roads between them) with pygame
+# The screen position of every city and road is projected once into NumPy arrays, the roads are drawn once into a background surface,
+# and every frame only the cities whose state changed (and the texts that changed) are drawn again, updating just those rectangles of the screen (dirty rects)
+# The loop is capped at fps frames per second, so it does not use a whole cpu when nothing changes
+# It has the same updateState / resetAllStates / maxPath / currentVisitedNode interface as Map, so a SearchEventPlayer can replay a search directly on it
+# cities, lat, lng: name and coordinates of every city, edges: (origin, destination) city name pairs
+class MapRenderer():
+    def __init__(self, cities, lat, lng, edges, title : str, screenWidth = 1200, screenHeight = 800, fps = 30, radius = 8):
+        self.cities = list(cities)
+        self.rows = {}
+        for row, city in enumerate(self.cities):
+            self.rows.setdefault(city, row)
+        self.title = title
+        self.screenSize = (screenWidth, screenHeight)
+        self.fps = fps
+        self.radius = radius
+
+        # Scale the latitude and longitude values to fit the screen (90% of it, moved 10% from the top left corner)
+        width, height = screenWidth * .9, screenHeight * .9
+        lat, lng = np.asarray(lat, dtype=np.float64), np.asarray(lng, dtype=np.float64)
+        latRange = (lat.max() - lat.min()) or 1
+        lngRange = (lng.max() - lng.min()) or 1
+        x = (lng - lng.min()) / lngRange * width + width / 10
+        y = height - (lat - lat.min()) / latRange * height + height / 10
+        self.positions = np.stack((x, y), axis=1).astype(np.int32)
+        self.bottomTextY = int(height - 40)
+
+        edgeRows = np.array([(self.rows[origin], self.rows[destination]) for origin, destination in edges if origin in self.rows and destination in self.rows], dtype=np.int64).reshape(-1, 2)
+        self.edgePositions = np.concatenate((self.positions[edgeRows[:, 0]], self.positions[edgeRows[:, 1]]), axis=1)
+
+        self.states = np.full(len(self.cities), "closed", dtype=object)
+        self.drawnStates = np.full(len(self.cities), None, dtype=object)
+        self.maxPath = 0
+        self.currentVisitedNode = ""
+        self.topText = None
+
+    ### Map interface, used by SearchEventPlayer
+    def updateState(self, city, state):
+        self.states[self.rows[city]] = state
+
+    def resetAllStates(self):
+        self.states[:] = "closed"
+
+    def setStates(self, states):
+        """Copies the state of every city at once (in the same order as cities), for example from a Map's DataFrame state column."""
+        self.states[:] = np.asarray(states, dtype=object)
+
+    def texts(self):
+        topText = self.topText if self.topText is not None else "Visited Node: " + str(self.currentVisitedNode)
+        return topText, "Current Path Cost: " + str(self.maxPath)
+
+    def drawBackground(self, screen, font):
+        background = pygame.Surface(self.screenSize)
+        background.fill(white)
+        # Draw the lines (connecting edges) between all the states on the map
+        for x1, y1, x2, y2 in self.edgePositions.tolist():
+            pygame.draw.line(background, black, (x1, y1), (x2, y2), 4)
+        titleText = font.render(f"{self.title}'s Map", True, black)
+        background.blit(titleText, ((self.screenSize[0] * .9 - titleText.get_width()) // 2, 20))
+        screen.blit(background, (0, 0))
+        return background
+
+    # onFrame: function called at the start of every frame (for example SearchEventPlayer.update), the loop ends when the window is closed
+    def run(self, onFrame = None):
+        pygame.init()
+        screen = pygame.display.set_mode(self.screenSize)
+        pygame.display.set_caption(f"{self.title} Map Visualization")
+        font = pygame.font.Font(None, 36)
+        clock = pygame.time.Clock()
+        background = self.drawBackground(screen, font)
+        pygame.display.flip()
+
+        drawnTexts = (None, None)
+        textRects = [pygame.Rect(40, 40, self.screenSize[0] - 80, 36), pygame.Rect(40, self.bottomTextY, self.screenSize[0] - 80, 36)]
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+            if onFrame is not None : onFrame()
+
+            dirtyRects = []
+            # Draw only the points whose state changed since the last frame
+            for row in np.flatnonzero(self.states != self.drawnStates).tolist():
+                x, y = self.positions[row].tolist()
+                rect = pygame.Rect(x - self.radius, y - self.radius, 2 * self.radius + 1, 2 * self.radius + 1)
+                screen.blit(background, rect, rect)
+                pygame.draw.circle(screen, stateColors.get(self.states[row], gray), (x, y), self.radius)
+                dirtyRects.append(rect)
+            self.drawnStates[:] = self.states
+
+            texts = self.texts()
+            for text, drawnText, rect in zip(texts, drawnTexts, textRects):
+                if text != drawnText:
+                    screen.blit(background, rect, rect)
+                    screen.blit(font.render(text, True, black), rect.topleft)
+                    dirtyRects.append(rect)
+            drawnTexts = texts
+
+            if dirtyRects : pygame.display.update(dirtyRects)
+            clock.tick(self.fps)
+        pygame.quit()
@@ -1,24 +1,48 @@
 from State import State
+from Solution import Solution
+import numpy as np
 
+# The attributes are slots (no __dict__ per node), since every expansion creates a node for every successor
+# fCost is set by the search, and hCost is only set once the hCost of the node is memoized (see utils.memoize), so it stays empty until then
 class Node:
+    __slots__ = ("parent", "state", "action", "pathCost", "fCost", "hCost")
+
     def __init__(self, state : State, parent = None, action = None, pathCost = 0):
         self.parent = parent
         self.state = state
         self.action = action
         self.pathCost = pathCost
+        self.fCost = 0
 
-    def getSolution(self):
+    # Returns the cities between the origin and this node as "city -> city -> ... -> " (the goal is printed after it)
+    # problem is only needed when the states are not the city names (for example, the integer ids of a CompiledMapProblem)
+    def getSolution(self, problem = None):
         if self.parent == None:
             return "The initial node was the node Goal, no actions were taken"
-        nodesPath = [node.action for node in self.path()[1:]]
-        displayString = ""
-        for i in range(len(nodesPath)):
-            print(f"Node {i}: {nodesPath[i]} type {type(nodesPath[i])}")
-            if i == len(nodesPath)-1:
-                return displayString
-            displayString += nodesPath[i][0] + " -> "
-        
-        return displayString
+        if problem is not None:
+            names = self.extractSolution(problem, False).names(problem)[1:-1]
+        else:
+            names = [node.state.name for node in self.path()[1:-1]]
+        return "".join(name + " -> " for name in names)
+
+    def extractSolution(self, problem, legCosts = True) -> Solution:
+        """Returns the Solution (state ids from the origin to this node, cost, and with legCosts the pathCost of every state) in two walks up the parents."""
+        size = self.depth() + 1
+        stateIds = np.empty(size, dtype=np.int64)
+        pathCosts = np.empty(size, dtype=np.float64) if legCosts else None
+        node, i = self, size - 1
+        while node is not None:
+            stateIds[i] = problem.stateId(node.state)
+            if legCosts : pathCosts[i] = node.pathCost
+            node, i = node.parent, i - 1
+        return Solution(stateIds, self.pathCost, pathCosts)
+
+    def depth(self) -> int:
+        """Number of actions from the root to this node."""
+        depth, node = 0, self.parent
+        while node is not None:
+            depth, node = depth + 1, node.parent
+        return depth
 
     def expand(self, problem, verbose = False):
         children = []
@@ -45,5 +69,10 @@ class Node:
             node = node.parent
         return list(reversed(path_back))
     
+    # the states are State objects (MapProblem) or integer ids (CompiledMapProblem), so a state without a name is printed as it is
     def __str__(self):
-        return f"Node: {self.state.name}, pathCost: {self.pathCost}, fCost: {self.fCost}, action: {self.action}, parent: {self.parent.state.name}"
+        parent = None if self.parent is None else stateLabel(self.parent.state)
+        return f"Node: {stateLabel(self.state)}, pathCost: {self.pathCost}, fCost: {self.fCost}, action: {self.action}, parent: {parent}"
+
+def stateLabel(state) -> str:
+    return getattr(state, "name", state)
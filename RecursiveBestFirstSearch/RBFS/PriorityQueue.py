@@ -0,0 +1,98 @@
+# Binary min heap of keys with priorities, and a key -> position index, used as the frontier of A*
+# push inserts a key or changes its priority (decrease key, or increase), pop returns the key with the lowest priority, all in O(log n), and key in queue is O(1)
+# priorities can be anything comparable (for example (fCost, tieBreaker) tuples), the keys have to be hashable
+class IndexedPriorityQueue():
+    def __init__(self):
+        self.heap : list[list] = [] # [priority, key] pairs
+        self.positions : dict = {}
+
+    def push(self, key, priority):
+        """Inserts key with priority, or moves it to priority if it is already in the queue."""
+        position = self.positions.get(key)
+        if position is None:
+            self.heap.append([priority, key])
+            self.positions[key] = len(self.heap) - 1
+            self.siftUp(len(self.heap) - 1)
+            return
+        oldPriority = self.heap[position][0]
+        self.heap[position][0] = priority
+        if priority < oldPriority:
+            self.siftUp(position)
+        else:
+            self.siftDown(position)
+
+    def decreaseKey(self, key, priority) -> bool:
+        """Lowers the priority of key (inserting it if it is not in the queue), returns False if its priority was already lower or the same."""
+        position = self.positions.get(key)
+        if position is not None and not priority < self.heap[position][0]:
+            return False
+        self.push(key, priority)
+        return True
+
+    def pop(self) -> tuple:
+        """Removes and returns the (key, priority) with the lowest priority."""
+        if not self.heap:
+            raise IndexError("pop from an empty IndexedPriorityQueue")
+        priority, key = self.heap[0]
+        self.removeAt(0)
+        return key, priority
+
+    def peek(self) -> tuple:
+        priority, key = self.heap[0]
+        return key, priority
+
+    def priority(self, key):
+        return self.heap[self.positions[key]][0]
+
+    def remove(self, key):
+        self.removeAt(self.positions[key])
+
+    def removeAt(self, position):
+        heap = self.heap
+        del self.positions[heap[position][1]]
+        last = heap.pop()
+        if position < len(heap):
+            heap[position] = last
+            self.positions[last[1]] = position
+            self.siftDown(position)
+            self.siftUp(position)
+
+    def siftUp(self, position):
+        heap, positions = self.heap, self.positions
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not entry[0] < heap[parent][0]:
+                break
+            heap[position] = heap[parent]
+            positions[heap[position][1]] = position
+            position = parent
+        heap[position] = entry
+        positions[entry[1]] = position
+
+    def siftDown(self, position):
+        heap, positions = self.heap, self.positions
+        entry = heap[position]
+        size = len(heap)
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if not heap[child][0] < entry[0]:
+                break
+            heap[position] = heap[child]
+            positions[heap[position][1]] = position
+            position = child
+        heap[position] = entry
+        positions[entry[1]] = position
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __bool__(self):
+        return len(self.heap) > 0
@@ -1,25 +1,37 @@
 from State import State
-from Map import Map
+from typing import TYPE_CHECKING
+if TYPE_CHECKING : from Map import Map # only used by the annotations, so importing the problems does not import pandas nor pygame
 import numpy as np
 from Node import Node
+from CompiledGraph import CompiledGraph
+from utils import LRUCache
 
 # initialState: string that represents the initial state, in this case, the initial node name
 # goalState: string that represents the goal state, in this case, the goal node name
 # mapInformationFile: string that represents the file with the adjacencyMap information
 class MapProblem():    
-    def __init__(self, initialState: State, goalState: State, mapDict: dict, map : Map = None):
+    def __init__(self, initialState: State, goalState: State, mapDict: dict, map : "Map" = None):
         self.initialState : State = initialState
         self.goalState : State = goalState
         self.adjacencyMap : dict = mapDict
         self.map = map
+        # names[i] is the city with id i (see stateId), numbered like CompiledGraph.fromAdjacencyMap does (the cities of the map first, then the destinations seen for the first time), so the ids of a city are the same in every process and in the compiled problem
+        self.names : list = list(mapDict)
+        self.ids : dict = {name: i for i, name in enumerate(self.names)}
+        for actions in mapDict.values():
+            for action in actions:
+                if action[0] not in self.ids:
+                    self.ids[action[0]] = len(self.names)
+                    self.names.append(action[0])
 
     def hCost(self, node : Node, verbose = False):
         """hCost function is the eucledian distance from a node's state to goal."""
         if verbose: print("\nNode:", node.state.name, "Goal:", self.goalState.name, "Distance:", self.map.getEuclideanDistance(node.state.name, self.goalState.name))
         return self.map.getEuclideanDistance(node.state.name, self.goalState.name)
         
+    # the states are interned (see State), so the goal is reached when the state is the goal state itself
     def goalTest(self, state : State) -> bool:
-        return state.name == self.goalState.name
+        return state is self.goalState
     
     # returns a list of actions that can be taken from the current state, which are the locations that can be reached from the current location
     def actions(self, state : State, verbose = False) -> list[str]:
@@ -27,21 +39,117 @@ class MapProblem():
         return self.adjacencyMap[state.name]
     
     def result(self, state: State, actionName : str) -> State:
-        nextState = State(actionName)
-        return nextState
+        return State(actionName) # the interned State of the city, no new object is created
     
-    def pathCost(self, costSoFar, currentState : State, action : str, nextState : State, verbose = False):
-        for action in self.adjacencyMap[currentState.name]:
-            if action[0] == nextState.name:
-                actionCost = action[1]
-        pathCost = costSoFar + (actionCost or np.inf)
+    # action is the [neighbor, cost] pair of the adjacency list the child was made from, so its cost is read directly (each parallel road keeps its own cost)
+    def pathCost(self, costSoFar, currentState : State, action : list, nextState : State, verbose = False):
+        actionCost = np.inf if action is None or action[1] is None else action[1]
+        pathCost = costSoFar + actionCost
         if verbose : print(f"Costs between {currentState.name} | {nextState.name}: Cost so far: {costSoFar}, ActionCost: {actionCost} PathCost:  {pathCost}")
         return pathCost
     
     """ HERE """
 
+    def stateName(self, state : State) -> str:
+        return state.name
+
+    # integer id of a state (see Solution), and the name of the state with that id
+    def stateId(self, state : State) -> int:
+        return self.ids[state.name]
+
+    def stateIdName(self, stateId : int) -> str:
+        return self.names[stateId]
+
+    def compile(self):
+        """Returns a CompiledMapProblem with the same origin, goal and map, but whose states are integer ids."""
+        return CompiledMapProblem(self.initialState, self.goalState, self.adjacencyMap, self.map)
+
+    def reversed(self):
+        """Returns the problem of going from the goal back to the origin on the reversed edges (the one solved by the backward half of a bidirectional search)."""
+        reverseMap = {city: [] for city in self.adjacencyMap}
+        for city, actions in self.adjacencyMap.items():
+            for action in actions:
+                reverseMap.setdefault(action[0], []).append([city, action[1]])
+        return MapProblem(self.goalState, self.initialState, reverseMap, self.map)
+
     def value(self, state):
         return 1
 
     def __repr__(self):
-        return "<MapProblem initial: {}, goal: {}>".format(self.initialState, self.goalState)
\ No newline at end of file
+        return "<MapProblem initial: {}, goal: {}>".format(self.initialState, self.goalState)
+
+# Same problem as MapProblem, but the adjacencyMap is compiled once into a CompiledGraph, so the states are the integer ids of the cities and the actions are (neighborId, cost) pairs
+# mapDict can be a data.json adjacency map or an already compiled graph (so many problems can share the same one)
+# precomputeHeuristic: when true (and there is a map), the hCost of every city to the goal is computed in one vectorized pass when the goal is set, and kept in self.heuristicTable (indexed by state id)
+# heuristicTables: LRU cache of those tables keyed by goal id, it can be shared between problems that use the same graph and map so repeated goals are not computed again
+class CompiledMapProblem(MapProblem):
+    def __init__(self, initialState: State, goalState: State, mapDict, map : "Map" = None, precomputeHeuristic = True, heuristicTables : LRUCache = None):
+        self.graph : CompiledGraph = mapDict if isinstance(mapDict, CompiledGraph) else CompiledGraph.fromAdjacencyMap(mapDict)
+        self.adjacencyMap : dict = None if isinstance(mapDict, CompiledGraph) else mapDict
+        self.initialState : int = self.graph.id(initialState.name)
+        self.map = map
+        self.precomputeHeuristic = precomputeHeuristic and map is not None
+        self.heuristicTables : LRUCache = heuristicTables if heuristicTables is not None else LRUCache()
+        self.heuristicTable : np.ndarray = None
+        self.setGoal(goalState)
+
+    def setGoal(self, goalState : State):
+        """Changes the goal of the problem, and loads (or builds) the heuristic table of the new goal."""
+        self.goalState : int = self.graph.id(goalState.name)
+        if self.precomputeHeuristic:
+            self.heuristicTable = self.heuristicTables.get(self.goalState, self.buildHeuristicTable)
+
+    def forQuery(self, initialState : State, goalState : State):
+        """Returns a new problem for another origin and goal that shares this problem's compiled graph, map and heuristic tables."""
+        return CompiledMapProblem(initialState, goalState, self.graph, self.map, self.precomputeHeuristic, self.heuristicTables)
+
+    def buildHeuristicTable(self) -> np.ndarray:
+        return self.map.distances_to(self.graph.names[self.goalState], self.graph.names)
+
+    def tableHCost(self, node : Node, verbose = False):
+        """Reads the hCost of the node's state from the precomputed heuristic table."""
+        return self.heuristicTable[node.state]
+
+    def hCost(self, node : Node, verbose = False):
+        """hCost function is the eucledian distance from a node's state to goal."""
+        if self.heuristicTable is not None:
+            distance = self.heuristicTable[node.state]
+        else:
+            distance = self.map.getEuclideanDistance(self.graph.names[node.state], self.graph.names[self.goalState])
+        if verbose: print("\nNode:", self.graph.names[node.state], "Goal:", self.graph.names[self.goalState], "Distance:", distance)
+        return distance
+
+    def goalTest(self, state : int) -> bool:
+        return state == self.goalState
+
+    # returns a list of (neighborId, cost) pairs, one for every city that can be reached from the current one
+    def actions(self, state : int, verbose = False) -> list[tuple]:
+        neighbors, weights = self.graph.neighborsOf(state)
+        if verbose : print("\nState:", self.graph.names[state], "\nADJACENCY\n", [self.graph.names[neighbor] for neighbor in neighbors], sep = "")
+        return list(zip(neighbors.tolist(), weights.tolist()))
+
+    def result(self, state : int, actionName : int) -> int:
+        return actionName
+
+    def pathCost(self, costSoFar, currentState : int, action : tuple, nextState : int, verbose = False):
+        pathCost = costSoFar + action[1]
+        if verbose : print(f"Costs between {self.graph.names[currentState]} | {self.graph.names[nextState]}: Cost so far: {costSoFar}, ActionCost: {action[1]} PathCost:  {pathCost}")
+        return pathCost
+
+    def stateName(self, state : int) -> str:
+        return self.graph.names[state]
+
+    def stateId(self, state : int) -> int:
+        return state
+
+    def stateIdName(self, stateId : int) -> str:
+        return self.graph.names[stateId]
+
+    def compile(self):
+        return self
+
+    def reversed(self):
+        return CompiledMapProblem(State(self.stateName(self.goalState)), State(self.stateName(self.initialState)), self.graph.reversed(), self.map, self.precomputeHeuristic)
+
+    def __repr__(self):
+        return "<CompiledMapProblem initial: {}, goal: {}>".format(self.stateName(self.initialState), self.stateName(self.goalState))
\ No newline at end of file
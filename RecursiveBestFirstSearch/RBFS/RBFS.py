@@ -1,12 +1,13 @@
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
-from Node import Node
 from State import State
 from Problem import MapProblem
 from Map import Map
-from utils import memoize
-import json, numpy as np, time
+from SearchContext import SearchContext
+from SearchEvents import SearchEventBuffer, SearchEventPlayer
+from SuccessorCache import SuccessorCache
+import json
 genVerbose = True
 nodeVerbose = False
 
@@ -35,83 +36,36 @@ if goal not in adjacencyData:
 # problem: a problem that can be solved with a recursive best first search, in this case, a graph that represents cities locations and distances between them, specifically from Mexico
 mexico1Node = MapProblem(State(origin), State(goal), adjacencyData, mexicoMap)
 
-# hCostFunction, best and alternative as kept as global variables to be used in the RBFS function
-hCostFunction = None
-best = None
-alternative = None
-
-# waiting times for the visualization
-waitingStart = 1 # 3
-waitingComplete = 2 # 5
-waitingParent = 1 # 2
+# when true, the adjacency data is compiled once into integer ids (CSR arrays), so the search does not hash city names nor create State objects
+compileGraph = True
+if compileGraph : mexico1Node = mexico1Node.compile()
 
 runVisualization = False
-# If dataHasHeuristics, then the data does not contain the adjacency (action value), but the heuristics itself, so our action cost will be 0
-def RecursiveBestFirstSearch(problem : MapProblem, hFunc = None) -> str:
-    global hCostFunction
-    hCostFunction = memoize(hFunc or problem.hCost, 'hCost')
 
-    # 
-    initialNode = Node(problem.initialState)
-    initialNode.fCost = hCostFunction(initialNode, nodeVerbose)
-
-    mexicoMap.updateState(initialNode.state.name, "start")
-    if runVisualization : time.sleep(waitingStart)
-    rbfsResult = RBFS(problem, initialNode, np.inf)
-    if rbfsResult[0] == None:
+# when true, the search runs on IterativeRBFS (explicit stack), so long paths do not reach Python's recursion limit
+iterativeSearch = True
+# when true, the successors of every expanded state are cached, so the states expanded again after a backtrack do not query the problem again
+cacheSuccessors = True
+# when true, RBFS skips the successors whose state is already on its current path (the parent, and any other ancestor, on these undirected maps)
+pruneCycles = False
+# If dataHasHeuristics, then the data does not contain the adjacency (action value), but the heuristics itself, so our action cost will be 0
+# every call creates its own SearchContext (hCost cache, counters, events), so it can run in many threads at the same time
+# events: SearchEventBuffer where the search is recorded for the visualization, None to run headless
+def RecursiveBestFirstSearch(problem : MapProblem, hFunc = None, events : SearchEventBuffer = None) -> str:
+    context = SearchContext(problem, hFunc, events, iterativeSearch, genVerbose, nodeVerbose, SuccessorCache() if cacheSuccessors else None, pruneCycles)
+    result = context.search()
+    if genVerbose : print("\nSEARCH STATS", context.stats, sep = "\n")
+    if result == None:
         return "No solution found"
     
-    mexicoMap.resetAllStates()
-    mexicoMap.updateState(rbfsResult[0].state.name, "goal")
-    solution = rbfsResult[0].getSolution()
-    print(f"Here is the result: {solution} {problem.goalState.name}, with a cost of {rbfsResult[0].pathCost}")
+    solution = result.getSolution(problem)
+    print(f"Here is the result: {solution} {problem.stateName(problem.goalState)}, with a cost of {result.pathCost}")
     return
 
-def RBFS(problem : MapProblem, node : Node, fLimit) -> Node:
-    global best, alternative
-    if problem.goalTest(node.state):
-        return node, 0 
-    
-    successors = node.expand(problem, nodeVerbose)
-
-    if len(successors) == 0:
-        return None, np.inf
-    
-    if runVisualization : time.sleep(waitingParent)
-    for succesor in successors:
-        mexicoMap.updateState(succesor.state.name, "frontier")
-        pathCost = succesor.pathCost
-        hCost = hCostFunction(succesor)
-        succesor.fCost = pathCost + hCost
-        if genVerbose: print("Succesor:", succesor.state.name, "pathCost:", succesor.pathCost, "hCost:", hCostFunction(succesor), "fCost:", succesor.fCost)
-
-    if runVisualization : time.sleep(waitingComplete)
-    mexicoMap.resetAllStates()
-    while True:
-        successors.sort(key=lambda x: x.fCost)
-        best = successors[0]
-
-        if best.fCost > fLimit:
-            return None, best.fCost
-        
-        if len(successors) > 1:
-            alternative = successors[1].fCost
-        else:
-            alternative = np.inf
-
-        ### Updates Visuals
-        mexicoMap.updateState(best.state.name, "open")
-        mexicoMap.maxPath = best.pathCost
-        mexicoMap.currentVisitedNode = best.state.name
-
-        result, best.fCost = RBFS(problem, best, min(fLimit, alternative))
-        if result is not None: # if result would also work
-            return result, best.fCost
-
 import threading
 
-def run_RBFS_as_thread(problem, hFunc=None):
-    thread = threading.Thread(target=RecursiveBestFirstSearch, args=(problem, hFunc))
+def run_RBFS_as_thread(problem, hFunc=None, events=None):
+    thread = threading.Thread(target=RecursiveBestFirstSearch, args=(problem, hFunc, events))
     thread.start()
     return thread
 
@@ -122,112 +76,18 @@ def run_RBFS_as_thread(problem, hFunc=None):
 
 # resultUpsideDown = RecursiveBestFirstSearch(testUpsideDown)
 
-import pandas as py, pygame, matplotlib.pyplot as plt, time
-mapForVisualization = mexicoMap.map
-def playVisualization(sleepTime = 2):
-        pygame.init()
-
-        # Define colors
-        red = (255, 0, 0)
-        green = (0, 255, 0)
-        blue = (0, 0, 255)
-        black = (0, 0, 0)
-        gray = (200, 200, 200)
-        white = (255, 255, 255)
-        pink = (235, 50, 180)
-        orange = (245, 115, 0)
-        
-        font = pygame.font.Font(None, 36)
-        titleText = font.render(f"{countryName}'s Map", True, black)
-        currentVisitedNode = font.render("Visited Node:", True, black)
-        currentPathCostText = font.render("Current Path Cost:", True, black)
-
-        # Set the width and height of the screen
-        screenWidth = 1200
-        screenHeight = 800
-        screen = pygame.display.set_mode((screenWidth, screenHeight))
-        pygame.display.set_caption(f"{countryName} Map Visualization")
-
-        textWidth = titleText.get_width()
-        textHeight = titleText.get_height()
-        
-        screenWidth *= .9
-        screenHeight *= .9
-
-        scaledMap = mapForVisualization.copy()
-        # Scale the latitude and longitude values to fit the screen
-        min_lat = mapForVisualization['lat'].min()
-        max_lat = mapForVisualization['lat'].max()
-        min_lng = mapForVisualization['lng'].min()
-        max_lng = mapForVisualization['lng'].max()
-
-        scaled_lat = (mapForVisualization['lat'] - min_lat) / (max_lat - min_lat) * screenHeight
-        scaled_lng = (mapForVisualization['lng'] - min_lng) / (max_lng - min_lng) * screenWidth
-        scaled_lat = screenHeight - scaled_lat
-
-        scaledMap['lat'] = scaled_lat
-        scaledMap['lng'] = scaled_lng
-        # Game loop
-        running = True
-
-        while running:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-            # Clear the screen
-            screen.fill(white)
-            
-            # Draw the lines (connecting edges) between all the states on the map
-            for origin, destinations in adjacencyData.items():
-                originData = scaledMap[scaledMap['city'] == origin]
-                xValue = originData['lng'].values[0] + screenWidth/10
-                yValue = originData['lat'].values[0] + screenHeight/10
-                originCoords = (int(xValue), int(yValue))
-
-                for destination in destinations:
-                    destinationData = scaledMap[scaledMap['city'] == destination[0]]
-                    destXValue = destinationData['lng'].values[0] + screenWidth/10
-                    destYValue =destinationData['lat'].values[0] + screenHeight/10
-                    destinationCoords = (int(destXValue), int(destYValue))
-                    pygame.draw.line(screen, black, originCoords, destinationCoords, 4)
-
-            # Draw the points
-            for lat, lng, state in zip(scaled_lat + screenHeight/10, scaled_lng + screenWidth/10, mapForVisualization['state']):
-                match (state):
-                    case "open":
-                        color = red
-                    case "closed":
-                        color = black
-                    case "frontier":
-                        color = green
-                    case "start":
-                        color = pink
-                    case "goal":
-                        color = orange
-                    case _:
-                        color = gray
-                pygame.draw.circle(screen, color, (int(lng), int(lat)), 8)
-
-            # Update the screen
-            textX = (screenWidth - textWidth) // 2
-            textY = 20
-            screen.blit(titleText, (textX, textY))
-
-            textY = 40
-            screen.blit(currentVisitedNode, (40, textY))
-            currentVisitedNode = font.render("Visited Node: " + str(mexicoMap.currentVisitedNode), True, black)
-
-            textY = screenHeight - 40
-            screen.blit(currentPathCostText, (40, textY))
-            currentPathCostText = font.render("Current Path Cost: " + str(mexicoMap.maxPath), True, black)
-            
-            pygame.display.flip()
-        pygame.quit()
-
-resultMexico1Node = run_RBFS_as_thread(mexico1Node, None)
-if runVisualization : playVisualization()
+from MapRenderer import MapRenderer
+# the positions of the cities and roads are projected once, and the renderer replays the recorded search events at most 30 frames per second
+def playVisualization(events : SearchEventBuffer, problem : MapProblem):
+    edges = [(origin, destination[0]) for origin, destinations in adjacencyData.items() for destination in destinations]
+    renderer = MapRenderer(mexicoMap.map['city'], mexicoMap.map['lat'], mexicoMap.map['lng'], edges, countryName)
+    player = SearchEventPlayer(events, renderer, problem.stateName)
+    renderer.run(player.update)
+
+# the search only records events when there is a visualization to replay them
+searchEvents = SearchEventBuffer() if runVisualization else None
+resultMexico1Node = run_RBFS_as_thread(mexico1Node, None, searchEvents)
+if runVisualization : playVisualization(searchEvents, mexico1Node)
 resultsToShow = [
     # [resultA, "Results A"],
     # [resultB, "Results B"],
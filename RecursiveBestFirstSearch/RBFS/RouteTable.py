@@ -0,0 +1,81 @@
+from CompiledGraph import CompiledGraph
+import numpy as np, heapq, json, os
+
+# All pairs shortest routes of a CompiledGraph, precomputed once (with a Dijkstra from every node) so repeated queries are table lookups instead of searches
+# distances[origin, goal] is the cost of the cheapest route (infinity when there is none)
+# nextHops[origin, goal] is the node that comes after origin on that route (-1 when there is none), so a route is read one hop at a time in O(its length)
+# The two n x n matrices are written as .npy files, and load memory maps them, so only the rows that are queried are read from the disk
+class RouteTable():
+    def __init__(self, names : list, distances : np.ndarray, nextHops : np.ndarray):
+        self.names : list = list(names)
+        self.ids : dict = {name: i for i, name in enumerate(self.names)}
+        self.distances : np.ndarray = distances
+        self.nextHops : np.ndarray = nextHops
+
+    @classmethod
+    def build(cls, graph : CompiledGraph, directory : str = None):
+        """Computes the routes between every pair of nodes of graph, with a directory the matrices are written there row by row (and memory mapped) instead of kept in memory."""
+        size = len(graph)
+        if directory is None:
+            distances, nextHops = np.empty((size, size), dtype=np.float64), np.empty((size, size), dtype=np.int32)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            distances = np.lib.format.open_memmap(os.path.join(directory, "distances.npy"), mode='w+', dtype=np.float64, shape=(size, size))
+            nextHops = np.lib.format.open_memmap(os.path.join(directory, "nextHops.npy"), mode='w+', dtype=np.int32, shape=(size, size))
+        for origin in range(size):
+            distances[origin], nextHops[origin] = firstHops(graph, origin)
+        table = cls(graph.names, distances, nextHops)
+        if directory is not None:
+            distances.flush()
+            nextHops.flush()
+            with open(os.path.join(directory, "names.json"), "w") as file:
+                json.dump(table.names, file)
+        return table
+
+    @classmethod
+    def load(cls, directory : str, mmap = True):
+        """Loads a table written by build, with mmap the matrices are memory mapped read only instead of copied."""
+        arrays = [np.load(os.path.join(directory, arrayName + ".npy"), mmap_mode='r' if mmap else None) for arrayName in ("distances", "nextHops")]
+        with open(os.path.join(directory, "names.json")) as file:
+            names = json.load(file)
+        return cls(names, *arrays)
+
+    def route(self, origin : str, goal : str) -> tuple[list, float]:
+        """Returns the (path, cost) of the cheapest route from origin to goal, path being the list of city names, or None if goal can not be reached (ValueError if the next hops cycle before reaching it)."""
+        originId, goalId = self.ids[origin], self.ids[goal]
+        cost = float(self.distances[originId, goalId])
+        if cost == np.inf:
+            return None
+        path = [originId]
+        # a cheapest route visits every node at most once, so a walk that has been through every node without reaching the goal is a cycle in nextHops (zero cost ties, or a corrupted table)
+        while path[-1] != goalId:
+            if len(path) >= len(self.names):
+                raise ValueError("the next hops from {} to {} do not reach the goal in {} hops".format(origin, goal, len(self.names) - 1))
+            path.append(int(self.nextHops[path[-1], goalId]))
+        return [self.names[node] for node in path], cost
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return "<RouteTable nodes: {}>".format(len(self.names))
+
+def firstHops(graph : CompiledGraph, source : int) -> tuple[np.ndarray, np.ndarray]:
+    """Dijkstra from source, returns the distance to every node and the first node after source on the route to it (-1 if it can not be reached, source for itself)."""
+    offsets, neighbors, weights = graph.offsets.tolist(), graph.neighbors.tolist(), graph.weights.tolist()
+    distances = [np.inf] * len(graph)
+    hops = [-1] * len(graph)
+    distances[source], hops[source] = 0.0, source
+    queue = [(0.0, source)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > distances[node]:
+            continue
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbor, newDistance = neighbors[edge], distance + weights[edge]
+            if newDistance < distances[neighbor]:
+                distances[neighbor] = newDistance
+                # the route to the neighbor starts as the (already final) route to node, or with the neighbor itself if node is the source
+                hops[neighbor] = neighbor if node == source else hops[node]
+                heapq.heappush(queue, (newDistance, neighbor))
+    return np.array(distances, dtype=np.float64), np.array(hops, dtype=np.int32)
@@ -0,0 +1,211 @@
+from Node import Node
+from utils import memoize
+from SearchStats import SearchStats
+from SearchEvents import SearchEventBuffer
+from SuccessorCache import SuccessorCache
+from SuccessorQueue import SuccessorQueue
+import numpy as np
+
+# A SearchContext owns all the state of one RBFS query: the problem, the hCost function (and its cache), the counters (self.stats) and the events recorded for the visualization
+# Nothing is kept in module globals, so many searches can run at the same time (in threads or processes) as long as each one uses its own context
+# events: SearchEventBuffer where the search records what it does (see SearchEvents), so a viewer can replay it at its own pace
+# with None (headless) nothing is recorded, and the search never touches a map nor sleeps
+# successorCache: SuccessorCache where the successors of every expanded state are kept, so expanding it again (after a backtrack) does not query the problem again, None to always expand
+# pruneCycles: RBFS skips the successors whose state is already on the current path (on undirected graphs every expansion generates the parent again),
+# the states of the path are kept in a set that is updated when RBFS goes down and back up, and the skipped successors are counted in stats.prunedSuccessors
+class SearchContext():
+    def __init__(self, problem, hFunc = None, events : SearchEventBuffer = None, iterative = True, verbose = False, nodeVerbose = False, successorCache : SuccessorCache = None, pruneCycles = False):
+        self.problem = problem
+        self.stats = SearchStats()
+        self.baseHCost = hFunc or problem.hCost
+        if hFunc is None and getattr(problem, 'heuristicTable', None) is not None:
+            self.cachedHCost = problem.tableHCost # the table already has the hCost of every state, so there is nothing to memoize
+        else:
+            self.cachedHCost = memoize(self.evaluateHCost, 'hCost')
+        self.events = events
+        self.successorCache = successorCache
+        self.iterative = iterative
+        self.verbose = verbose
+        self.nodeVerbose = nodeVerbose
+        self.result : Node = None
+        # the fCost of a node is pathCost + hWeight * hCost, 1 for RBFS (weighted searches, like AStarContext, change it)
+        self.hWeight = 1
+        # nodes the search keeps in memory right now (the peak is stats.maxStoredNodes)
+        self.storedNodes = 0
+        self.pruneCycles = pruneCycles
+        self.pathStates : set = set() # names of the states on the current RBFS path (only with pruneCycles)
+
+    def hCostFunction(self, node : Node, *args):
+        self.stats.heuristicLookups += 1
+        return self.cachedHCost(node, *args)
+
+    # only called when the hCost is not in the cache (or table)
+    def evaluateHCost(self, node : Node, *args):
+        self.stats.heuristicEvaluations += 1
+        return self.baseHCost(node, *args)
+
+    def storeNodes(self, count : int):
+        """Adds count nodes (negative to release them) to the nodes kept in memory by the search."""
+        self.storedNodes += count
+        if self.storedNodes > self.stats.maxStoredNodes : self.stats.maxStoredNodes = self.storedNodes
+
+    def search(self) -> Node:
+        """Runs the search (see run) from the initial state of the problem, and returns the goal node or None if there is no solution."""
+        with self.stats.phase("initialize"):
+            initialNode = Node(self.problem.initialState)
+            initialNode.fCost = self.hWeight * self.hCostFunction(initialNode, self.nodeVerbose)
+            self.storedNodes = 0
+            self.storeNodes(1)
+
+        if self.events is not None : self.events.append(("start", initialNode.state, initialNode.fCost))
+        with self.stats.phase("search"):
+            self.result, bestf = self.run(initialNode)
+        if self.result is None:
+            return None
+
+        self.stats.solutionDepth = self.result.depth()
+        if self.events is not None : self.events.append(("goal", self.result.state, self.result.pathCost))
+        return self.result
+
+    # Searches from initialNode, and returns (goal node, fCost), or (None, fCost) if there is no solution
+    # RBFS by default (IterativeRBFS if self.iterative), other searches (AStarContext, IDAStarContext) override it
+    def run(self, initialNode : Node) -> tuple:
+        return (self.IterativeRBFS if self.iterative else self.RBFS)(initialNode, np.inf)
+
+    def RBFS(self, node : Node, fLimit, depth = 0) -> Node:
+        if depth > self.stats.maxDepth : self.stats.maxDepth = depth
+        if self.problem.goalTest(node.state):
+            return node, 0
+
+        successors = self.evaluateSuccessors(node)
+        if self.pruneCycles:
+            stateName = self.problem.stateName(node.state)
+            self.pathStates.add(stateName)
+            successors = self.pruneSuccessors(successors)
+
+        if len(successors) == 0:
+            if self.pruneCycles : self.pathStates.discard(stateName)
+            return None, np.inf
+
+        successors = SuccessorQueue(successors)
+        self.storeNodes(len(successors))
+        while True:
+            best = successors.best()
+
+            # an infinite fCost (every path below best ends without reaching the goal, for example because all its successors were pruned) is a failure even when fLimit is infinite too
+            if best.fCost > fLimit or best.fCost == np.inf:
+                self.storeNodes(-len(successors))
+                if self.pruneCycles : self.pathStates.discard(stateName)
+                return None, best.fCost
+
+            alternative = successors.alternative()
+
+            if self.events is not None : self.events.append(("open", best.state, best.pathCost))
+
+            result, fCost = self.RBFS(best, min(fLimit, alternative), depth + 1)
+            if result is not None: # if result would also work
+                best.fCost = fCost
+                self.storeNodes(-len(successors))
+                if self.pruneCycles : self.pathStates.discard(stateName)
+                return result, best.fCost
+            successors.backup(fCost)
+            self.stats.backups += 1
+            if self.events is not None : self.events.append(("backup", best.state, best.fCost))
+
+    # Expands node and gives every successor its fCost (pathCost + hCost)
+    def evaluateSuccessors(self, node : Node) -> list[Node]:
+        # the cache is keyed by the integer id of the state (the same for every State object of a city), not by the state itself
+        stateId = self.problem.stateId(node.state) if self.successorCache is not None else None
+        cached = self.successorCache.get(stateId) if stateId is not None else None
+        if cached is not None:
+            self.stats.successorCacheHits += 1
+            successors = [Node(nextState, node, action, node.pathCost + stepCost) for action, nextState, stepCost, hCost in cached]
+            hCosts = [entry[3] for entry in cached]
+        else:
+            successors = node.expand(self.problem, self.nodeVerbose)
+            hCosts = [self.hCostFunction(succesor) for succesor in successors]
+            if self.successorCache is not None:
+                # the step cost is computed from 0, so node.pathCost + stepCost is exactly the problem's pathCost for any other node of the same state
+                self.successorCache.put(stateId, [(succesor.action, succesor.state, self.problem.pathCost(0, node.state, succesor.action, succesor.state), hCost) for succesor, hCost in zip(successors, hCosts)])
+        self.stats.countExpansion(self.problem.stateName(node.state), len(successors))
+        if len(successors) == 0:
+            return successors
+
+        events = self.events
+        if events is not None : events.append(("expand", node.state, None))
+        for succesor, hCost in zip(successors, hCosts):
+            succesor.fCost = succesor.pathCost + self.hWeight * hCost
+            if events is not None : events.append(("frontier", succesor.state, succesor.fCost))
+            if self.verbose: print("Succesor:", self.problem.stateName(succesor.state), "pathCost:", succesor.pathCost, "hCost:", hCost, "fCost:", succesor.fCost)
+
+        if events is not None : events.append(("reset", None, None))
+        return successors
+
+    # Removes the successors whose state is on the current path (pathStates), and counts them in stats.prunedSuccessors
+    def pruneSuccessors(self, successors : list[Node]) -> list[Node]:
+        pathStates, stateName = self.pathStates, self.problem.stateName
+        kept = [succesor for succesor in successors if stateName(succesor.state) not in pathStates]
+        self.stats.prunedSuccessors += len(successors) - len(kept)
+        return kept
+
+    # Same search as RBFS (same results and fCost backups), but the recursion is replaced by an explicit stack of [node, successors (SuccessorQueue), fLimit, best] frames
+    # returned holds the (result, fCost) of the last frame that finished, so its parent frame can back it up into its best successor as the recursive call does
+    def IterativeRBFS(self, node : Node, fLimit) -> Node:
+        frames = []
+        returned = None
+        while True:
+            if node is not None:
+                # "calls" RBFS on node: either it returns right away, or a new frame is pushed
+                if len(frames) > self.stats.maxDepth : self.stats.maxDepth = len(frames)
+                if self.problem.goalTest(node.state):
+                    returned = node, 0
+                else:
+                    successors = self.evaluateSuccessors(node)
+                    if self.pruneCycles:
+                        self.pathStates.add(self.problem.stateName(node.state))
+                        successors = self.pruneSuccessors(successors)
+                    if len(successors) == 0:
+                        if self.pruneCycles : self.pathStates.discard(self.problem.stateName(node.state))
+                        returned = None, np.inf
+                    else:
+                        frames.append([node, SuccessorQueue(successors), fLimit, None])
+                        self.storeNodes(len(successors))
+                        returned = None
+                node = None
+
+            if len(frames) == 0:
+                return returned
+
+            frame = frames[-1]
+            successors, fLimit = frame[1], frame[2]
+            if returned is not None:
+                result, fCost = returned
+                if result is not None:
+                    frame[3].fCost = fCost
+                    self.popFrame(frames)
+                    returned = result, fCost
+                    continue
+                successors.backup(fCost)
+                self.stats.backups += 1
+                if self.events is not None : self.events.append(("backup", frame[3].state, frame[3].fCost))
+
+            best = successors.best()
+
+            # an infinite fCost (every path below best ends without reaching the goal, for example because all its successors were pruned) is a failure even when fLimit is infinite too
+            if best.fCost > fLimit or best.fCost == np.inf:
+                self.popFrame(frames)
+                returned = None, best.fCost
+                continue
+
+            alternative = successors.alternative()
+
+            if self.events is not None : self.events.append(("open", best.state, best.pathCost))
+
+            frame[3] = best
+            node, fLimit = best, min(fLimit, alternative)
+
+    def popFrame(self, frames : list):
+        """Pops the last IterativeRBFS frame, releasing its successors (and its state from the path)."""
+        frame = frames.pop()
+        self.storeNodes(-len(frame[1]))
+        if self.pruneCycles : self.pathStates.discard(self.problem.stateName(frame[0].state))
@@ -0,0 +1,75 @@
+from collections import deque
+import time
+
+# Events recorded by a SearchContext, so the search never touches the visualization itself
+# Every event is a (kind, state, value) tuple:
+#   ("start", state, fCost)       the initial node
+#   ("expand", state, None)       state is being expanded
+#   ("frontier", state, fCost)    a successor of the expanded state with its fCost
+#   ("reset", None, None)         all the successors of the expanded state were recorded
+#   ("open", state, pathCost)     state is the best successor, the search goes down into it
+#   ("backup", state, fCost)      the subtree of state failed, and fCost was backed up into it
+#   ("goal", state, pathCost)     state is the goal
+EVENT_KINDS = ("start", "expand", "frontier", "reset", "open", "backup", "goal")
+
+# Bounded buffer of events: the search appends, the viewer pops at its own pace
+# When it is full the oldest events are dropped (and counted in dropped), so a slow viewer never slows down nor blocks the search
+# deque's append and popleft are thread safe, so the search and the viewer can run in different threads
+class SearchEventBuffer():
+    def __init__(self, maxsize = 100000):
+        self.events = deque(maxlen=maxsize)
+        self.recorded = 0
+        self.popped = 0
+
+    def append(self, event : tuple):
+        self.events.append(event)
+        self.recorded += 1
+
+    def pop(self) -> tuple:
+        """Returns the oldest event, or None if there are no events."""
+        try:
+            event = self.events.popleft()
+        except IndexError:
+            return None
+        self.popped += 1
+        return event
+
+    def dropped(self) -> int:
+        return self.recorded - self.popped - len(self.events)
+
+    def __len__(self):
+        return len(self.events)
+
+# Replays the events of a buffer on a Map (updateState, resetAllStates, maxPath, currentVisitedNode), waiting delays[kind] seconds after each kind of event
+# update() is meant to be called once per frame by the viewer, it applies every event whose time has come and returns right away
+# stateName: function that turns the states of the events into the city names of the map (problem.stateName)
+class SearchEventPlayer():
+    def __init__(self, buffer : SearchEventBuffer, map, stateName, delays : dict = None):
+        self.buffer = buffer
+        self.map = map
+        self.stateName = stateName
+        # waiting times for the visualization
+        self.delays = delays if delays is not None else {"start": 1, "expand": 1, "reset": 2}
+        self.nextEventTime = 0
+
+    def update(self):
+        now = time.monotonic()
+        while now >= self.nextEventTime:
+            event = self.buffer.pop()
+            if event is None:
+                return
+            self.apply(event)
+            self.nextEventTime = now + self.delays.get(event[0], 0)
+
+    def apply(self, event : tuple):
+        kind, state, value = event
+        match (kind):
+            case "start" | "frontier" | "goal":
+                if kind == "goal" : self.map.resetAllStates()
+                self.map.updateState(self.stateName(state), kind)
+            case "reset":
+                self.map.resetAllStates()
+            case "open":
+                self.map.updateState(self.stateName(state), "open")
+                self.map.maxPath = value
+                self.map.currentVisitedNode = self.stateName(state)
@@ -0,0 +1,91 @@
+from collections import Counter
+from contextlib import contextmanager
+import time
+
+# Counters of one RBFS run, every SearchContext has one in context.stats
+# generatedNodes: successors created by expansions, expandedNodes: expansions (a state expanded again counts again), expansionsPerState: expansions of every state
+# heuristicLookups: calls to the hCost function, heuristicEvaluations: the ones that had to compute it (the rest were answered by the node cache or the heuristic table)
+# successorCacheHits: expansions answered by the SuccessorCache of the context (they are still counted as expansions)
+# prunedSuccessors: generated successors skipped because their state was already on the current path (SearchContext pruneCycles)
+# maxDepth: deepest recursion (or stack frame) reached, backups: times a subtree failed and its best fCost was backed up into its root
+# maxStoredNodes: most nodes kept in memory at once (the successors on the RBFS path, the path of IDA*, or the frontier of A* and bidirectional A*), iterations: fCost limits tried by IDA*
+# phaseTimes: wall time in seconds of every phase (see phase)
+class SearchStats():
+    def __init__(self):
+        self.generatedNodes = 0
+        self.expandedNodes = 0
+        self.expansionsPerState = Counter()
+        self.heuristicLookups = 0
+        self.heuristicEvaluations = 0
+        self.successorCacheHits = 0
+        self.prunedSuccessors = 0
+        self.maxDepth = 0
+        self.backups = 0
+        self.maxStoredNodes = 0
+        self.iterations = 0
+        self.solutionDepth = None
+        self.phaseTimes = {}
+
+    @contextmanager
+    def phase(self, name : str):
+        """Adds the wall time of the with block to phaseTimes[name]."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phaseTimes[name] = self.phaseTimes.get(name, 0) + time.perf_counter() - start
+
+    def countExpansion(self, state, successors : int):
+        self.expandedNodes += 1
+        self.generatedNodes += successors
+        self.expansionsPerState[state] += 1
+
+    def heuristicCacheHits(self) -> int:
+        return self.heuristicLookups - self.heuristicEvaluations
+
+    def reExpansions(self) -> int:
+        """Expansions of states that had already been expanded before."""
+        return self.expandedNodes - len(self.expansionsPerState)
+
+    def reExpansionRatio(self) -> float:
+        return self.expandedNodes / len(self.expansionsPerState) if self.expansionsPerState else 0
+
+    def effectiveBranchingFactor(self, tolerance = 1e-6) -> float:
+        """b* such that a uniform tree of depth solutionDepth has the generatedNodes that were not pruned: b* + b*^2 + ... + b*^d = N, or None if there is no solution depth."""
+        depth, generated = self.solutionDepth, self.generatedNodes - self.prunedSuccessors
+        if not depth or generated == 0:
+            return None
+        def treeSize(b):
+            return sum(b ** i for i in range(1, depth + 1))
+        low, high = 0.0, max(1.0, float(generated))
+        while high - low > tolerance:
+            middle = (low + high) / 2
+            if treeSize(middle) < generated:
+                low = middle
+            else:
+                high = middle
+        return (low + high) / 2
+
+    def summary(self) -> dict:
+        return {
+            "generatedNodes": self.generatedNodes,
+            "expandedNodes": self.expandedNodes,
+            "uniqueExpandedStates": len(self.expansionsPerState),
+            "reExpansions": self.reExpansions(),
+            "reExpansionRatio": self.reExpansionRatio(),
+            "heuristicLookups": self.heuristicLookups,
+            "heuristicEvaluations": self.heuristicEvaluations,
+            "heuristicCacheHits": self.heuristicCacheHits(),
+            "successorCacheHits": self.successorCacheHits,
+            "prunedSuccessors": self.prunedSuccessors,
+            "maxDepth": self.maxDepth,
+            "backups": self.backups,
+            "maxStoredNodes": self.maxStoredNodes,
+            "iterations": self.iterations,
+            "solutionDepth": self.solutionDepth,
+            "effectiveBranchingFactor": self.effectiveBranchingFactor(),
+            "phaseTimes": dict(self.phaseTimes),
+        }
+
+    def __str__(self):
+        return "\n".join(f"{key}: {value}" for key, value in self.summary().items())
@@ -0,0 +1,29 @@
+import numpy as np
+
+# Compact solution of a search, extracted from its goal node with Node.extractSolution in one walk up the parents (no lists of nodes, no reversals, no strings)
+# stateIds: array with the id of every state of the path, from the origin to the goal (problem.stateId: the index of the city in the problem's graph, the same for a MapProblem and its compiled one, and in every process)
+# cost: pathCost of the goal, pathCosts: pathCost of every state of the path (None if the per leg costs were not extracted)
+# Turning the ids into city names (names, format) is a separate step, only done for the solutions that are shown
+class Solution():
+    __slots__ = ("stateIds", "cost", "pathCosts")
+
+    def __init__(self, stateIds : np.ndarray, cost, pathCosts : np.ndarray = None):
+        self.stateIds : np.ndarray = stateIds
+        self.cost = cost
+        self.pathCosts : np.ndarray = pathCosts
+
+    def legCosts(self) -> np.ndarray:
+        """Cost of every leg of the path (legCosts()[i] goes from stateIds[i] to stateIds[i + 1]), or None if the path costs were not extracted."""
+        return None if self.pathCosts is None else np.diff(self.pathCosts)
+
+    def names(self, problem) -> list[str]:
+        return [problem.stateIdName(stateId) for stateId in self.stateIds.tolist()]
+
+    def format(self, problem, separator = " -> ") -> str:
+        return separator.join(self.names(problem))
+
+    def __len__(self):
+        return len(self.stateIds)
+
+    def __repr__(self):
+        return "<Solution states: {}, cost: {}>".format(len(self.stateIds), self.cost)
@@ -0,0 +1,156 @@
+from State import State
+from Problem import MapProblem
+from SearchContext import SearchContext
+from AStar import AStarContext
+from IDAStar import IDAStarContext
+from Bidirectional import BidirectionalContext
+from SearchEvents import SearchEventBuffer, SearchEventPlayer
+from CoordinateTable import CoordinateTable
+from CompiledGraph import CompiledGraph
+from Landmarks import LandmarkHeuristic
+from RouteTable import RouteTable
+from SuccessorCache import SuccessorCache
+import MapCache
+import json, os, threading
+
+# Headless RBFS solver, it can be imported from other modules (it does not run anything on import)
+# Only the search modules and NumPy are imported: the coordinates come from the binary map cache (MapCache),
+# pandas is only imported the first time a country is used (to read the csv and write its cache), and pygame only by visualize
+
+# the data files are found next to this module, so the solver works from any working directory
+moduleDirectory = os.path.dirname(os.path.abspath(__file__))
+defaultDataFile = os.path.join(moduleDirectory, "data.json")
+defaultMapsFile = os.path.join(moduleDirectory, "worldcities.csv")
+defaultLandmarkDirectory = os.path.join(moduleDirectory, "landmarkCache")
+defaultRouteDirectory = os.path.join(moduleDirectory, "routeCache")
+
+# hCost of the problems: the euclidean distance between the coordinates of the cities, or the ALT lower bound of the road distance (admissible, see Landmarks)
+heuristics = ("euclidean", "landmarks")
+
+def loadCoordinates(countryName = "Mexico", citiesPerState = 1, mapsFile = defaultMapsFile, cacheDirectory = None) -> CoordinateTable:
+    """Returns the CoordinateTable of the country, from its map cache (or from a Map that writes it, if it is not cached yet)."""
+    coordinates = MapCache.loadCoordinateTable(mapsFile, countryName, citiesPerState, cacheDirectory)
+    if coordinates is None:
+        from Map import Map # imports pandas, only needed once per country and csv
+        coordinates = Map(countryName, citiesPerState, mapsFile=mapsFile, cacheDirectory=cacheDirectory).coordinateTable
+    return coordinates
+
+def loadAdjacency(dataset = "mexico1Node", dataFile = defaultDataFile) -> dict:
+    with open(dataFile) as file:
+        data = json.load(file)
+    if dataset not in data:
+        raise ValueError(f"Dataset {dataset} does not exist on {dataFile}, valid datasets: {', '.join(data)}")
+    return data[dataset]
+
+def loadLandmarks(dataset = "mexico1Node", dataFile = defaultDataFile, landmarks = 8, landmarkDirectory = defaultLandmarkDirectory) -> LandmarkHeuristic:
+    """Returns the LandmarkHeuristic of dataset with that many landmarks, built (and saved on landmarkDirectory) only the first time, it is keyed by the hash of dataFile so it is built again when the data changes."""
+    directory = os.path.join(landmarkDirectory, f"{dataset}_k{landmarks}_{MapCache.fileHash(dataFile, stampDirectory=landmarkDirectory)[:16]}")
+    if os.path.exists(os.path.join(directory, "names.json")):
+        return LandmarkHeuristic.load(directory)
+    heuristic = LandmarkHeuristic.build(CompiledGraph.fromAdjacencyMap(loadAdjacency(dataset, dataFile)), landmarks)
+    heuristic.save(directory)
+    return heuristic
+
+# Builds the problem of going from origin to goal on a dataset of dataFile, with the coordinates of countryName as heuristic
+# compileGraph: use a CompiledMapProblem (integer states and a precomputed heuristic table) instead of a MapProblem
+# heuristic: "landmarks" uses the ALT lower bounds of loadLandmarks (with that many landmarks) as the map instead of the coordinates, so the coordinates are not loaded
+def loadProblem(origin : str, goal : str, dataset = "mexico1Node", dataFile = defaultDataFile, countryName = "Mexico", citiesPerState = 1, mapsFile = defaultMapsFile, cacheDirectory = None, compileGraph = True,
+                heuristic = "euclidean", landmarks = 8, landmarkDirectory = defaultLandmarkDirectory) -> MapProblem:
+    adjacencyData = loadAdjacency(dataset, dataFile)
+    if origin not in adjacencyData:
+        raise ValueError(f"Origin {origin} does not exist on the problem, please change to a valid node.")
+    if goal not in adjacencyData:
+        raise ValueError(f"Goal {goal} does not exist on the problem, please change to a valid node.")
+
+    match (heuristic):
+        case "euclidean":
+            problem = MapProblem(State(origin), State(goal), adjacencyData, loadCoordinates(countryName, citiesPerState, mapsFile, cacheDirectory))
+        case "landmarks":
+            problem = MapProblem(State(origin), State(goal), adjacencyData, loadLandmarks(dataset, dataFile, landmarks, landmarkDirectory))
+        case _:
+            raise ValueError(f"Unknown heuristic {heuristic}, valid heuristics: {', '.join(heuristics)}")
+    return problem.compile() if compileGraph else problem
+
+# search engines that can solve the problems, all of them return the same results and SearchStats
+engines = ("rbfs", "astar", "wastar", "idastar", "bidirectional")
+
+def createContext(problem : MapProblem, engine = "rbfs", iterative = True, events : SearchEventBuffer = None, successorCache : SuccessorCache = None, weight = 2, pruneCycles = False) -> SearchContext:
+    """Returns the SearchContext of engine for problem, weight is the hCost weight of weighted A* (wastar), and pruneCycles makes RBFS skip the states already on its path."""
+    match (engine):
+        case "rbfs":
+            return SearchContext(problem, None, events, iterative, successorCache=successorCache, pruneCycles=pruneCycles)
+        case "astar":
+            return AStarContext(problem, None, events, successorCache=successorCache)
+        case "wastar":
+            return AStarContext(problem, None, events, weight, successorCache=successorCache)
+        case "idastar":
+            return IDAStarContext(problem, None, events, successorCache=successorCache)
+        case "bidirectional":
+            return BidirectionalContext(problem, None, events, successorCache=successorCache)
+    raise ValueError(f"Unknown engine {engine}, valid engines: {', '.join(engines)}")
+
+def solve(problem : MapProblem, iterative = True, events : SearchEventBuffer = None, successorCache : SuccessorCache = None, engine = "rbfs", weight = 2, pruneCycles = False) -> SearchContext:
+    """Runs the engine (RBFS by default) on problem, and returns its SearchContext (context.result is the goal node, or None if there is no solution, and context.stats has the counters)."""
+    context = createContext(problem, engine, iterative, events, successorCache, weight, pruneCycles)
+    context.search()
+    return context
+
+def solution(problem : MapProblem, context : SearchContext) -> tuple[list, float]:
+    """Returns the (path, cost) of a solved context, path being the list of city names from origin to goal, or None if there is no solution."""
+    if context.result is None:
+        return None
+    solution = context.result.extractSolution(problem, False)
+    return solution.names(problem), solution.cost
+
+def compareEngines(problem : MapProblem, engineNames = engines, iterative = True, weight = 2, successorCacheSize = 0, pruneCycles = False) -> list[dict]:
+    """Solves problem with every engine of engineNames (each one with its own successor cache, if successorCacheSize), and returns one row per engine with its cost, counters and search time."""
+    rows = []
+    for engine in engineNames:
+        context = solve(problem, iterative, None, SuccessorCache(successorCacheSize) if successorCacheSize > 0 else None, engine, weight, pruneCycles)
+        result = solution(problem, context)
+        stats = context.stats
+        rows.append({"engine": engine, "cost": result[1] if result else None, "expandedNodes": stats.expandedNodes, "generatedNodes": stats.generatedNodes,
+                     "maxStoredNodes": stats.maxStoredNodes, "seconds": stats.phaseTimes["search"]})
+    return rows
+
+def routeTableDirectory(dataset = "mexico1Node", dataFile = defaultDataFile, routeDirectory = defaultRouteDirectory) -> str:
+    return os.path.join(routeDirectory, f"{dataset}_{MapCache.fileHash(dataFile, stampDirectory=routeDirectory)[:16]}")
+
+def precomputeRoutes(dataset = "mexico1Node", dataFile = defaultDataFile, routeDirectory = defaultRouteDirectory) -> RouteTable:
+    """Writes the RouteTable of dataset (the routes between all its cities) on routeDirectory, keyed by the hash of dataFile, and returns it."""
+    return RouteTable.build(CompiledGraph.fromAdjacencyMap(loadAdjacency(dataset, dataFile)), routeTableDirectory(dataset, dataFile, routeDirectory))
+
+def loadRouteTable(dataset = "mexico1Node", dataFile = defaultDataFile, routeDirectory = defaultRouteDirectory) -> RouteTable:
+    """Returns the memory mapped RouteTable of dataset, or None if it was not precomputed (or dataFile changed since then)."""
+    directory = routeTableDirectory(dataset, dataFile, routeDirectory)
+    if not os.path.exists(os.path.join(directory, "names.json")):
+        return None
+    return RouteTable.load(directory)
+
+def route(origin : str, goal : str, dataset = "mexico1Node", dataFile = defaultDataFile, routeDirectory = defaultRouteDirectory, routeTable : RouteTable = None, **problemArguments) -> tuple[list, float]:
+    """Returns the (path, cost) from origin to goal (or None if there is no route) read from the precomputed RouteTable of dataset,
+    if there is none, the problem is loaded (with problemArguments, see loadProblem) and solved with RBFS."""
+    if routeTable is None:
+        routeTable = loadRouteTable(dataset, dataFile, routeDirectory)
+    if routeTable is not None:
+        if origin not in routeTable.ids or goal not in routeTable.ids:
+            raise ValueError(f"{origin if origin not in routeTable.ids else goal} does not exist on the problem, please change to a valid node.")
+        return routeTable.route(origin, goal)
+    problem = loadProblem(origin, goal, dataset, dataFile, **problemArguments)
+    return solution(problem, solve(problem))
+
+# Solves the problem in a thread while its events are replayed on a MapRenderer (imports pygame), returns the SearchContext when the window is closed
+# coordinates: CoordinateTable of the cities to draw, by default the map of the problem (it has to be given when the problem uses the landmarks heuristic)
+def visualize(problem : MapProblem, title : str, iterative = True, successorCache : SuccessorCache = None, engine = "rbfs", weight = 2, coordinates : CoordinateTable = None, pruneCycles = False) -> SearchContext:
+    from MapRenderer import MapRenderer
+    events = SearchEventBuffer()
+    contexts = []
+    thread = threading.Thread(target=lambda: contexts.append(solve(problem, iterative, events, successorCache, engine, weight, pruneCycles)))
+    thread.start()
+
+    coordinates = coordinates if coordinates is not None else problem.map
+    edges = [(origin, destination[0]) for origin, destinations in problem.adjacencyMap.items() for destination in destinations]
+    renderer = MapRenderer(coordinates.cities, coordinates.coordinates[:, 0], coordinates.coordinates[:, 1], edges, title)
+    renderer.run(SearchEventPlayer(events, renderer, problem.stateName).update)
+    thread.join()
+    return contexts[0]
@@ -1,3 +1,40 @@
+import threading
+
+# States are interned: State(name) always returns the same object for the same name, so the problems do not create a new State on every expansion,
+# two states are equal only if they are the same object (so they hash and compare by identity, in O(1)), and every one has a stable integer id
+# id: position of the state in State.states (the order in which the names were first seen by this process), so it can index arrays (heuristic tables, visit counters, caches)
+# The id is local to the process (another process numbers the same names in another order), so anything that leaves the process (a pickled State, a Solution) uses the name or the problem's stateId instead
 class State:
-    def __init__(self, name):
-        self.name = name
\ No newline at end of file
+    __slots__ = ("name", "id")
+    registry : dict = {} # name -> State
+    states : list = [] # id -> State
+    lock = threading.Lock()
+
+    def __new__(cls, name):
+        state = cls.registry.get(name)
+        if state is None:
+            with cls.lock: # only the first State of every name takes the lock
+                state = cls.registry.get(name)
+                if state is None:
+                    state = object.__new__(cls)
+                    state.name = name
+                    state.id = len(cls.states)
+                    cls.states.append(state)
+                    cls.registry[name] = state
+        return state
+
+    @classmethod
+    def fromId(cls, stateId : int):
+        return cls.states[stateId]
+
+    @classmethod
+    def count(cls) -> int:
+        """Number of states created so far (the size an array indexed by State.id needs)."""
+        return len(cls.states)
+
+    def __reduce__(self):
+        # pickled by name, so the State is interned again in the process that loads it
+        return State, (self.name,)
+
+    def __repr__(self):
+        return "<State {} ({})>".format(self.name, self.id)
@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+# Transposition cache of the successors of the states expanded by a SearchContext
+# RBFS forgets a subtree when it backtracks, and expands the same states again later (see SearchStats.reExpansions), so for every expanded state (keyed by problem.stateId)
+# the cache keeps the (action, nextState, stepCost, hCost) of its successors, and expanding it again only creates the Nodes, without asking the problem for its actions, results, costs nor heuristics
+# The hCosts are the ones of the goal of the search that filled it, so a cache must only be shared by searches with the same problem goal and hFunc
+# maxSuccessors: memory budget, in stored successors (every one is a small tuple), when it is exceeded the least recently used states are evicted
+class SuccessorCache():
+    def __init__(self, maxSuccessors = 1 << 16):
+        self.maxSuccessors = maxSuccessors
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, state) -> list[tuple]:
+        """Returns the cached successors of state, or None if they are not cached."""
+        successors = self.entries.get(state)
+        if successors is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(state)
+        return successors
+
+    def put(self, state, successors : list[tuple]):
+        if len(successors) > self.maxSuccessors:
+            return
+        if state in self.entries:
+            self.size -= len(self.entries.pop(state))
+        self.entries[state] = successors
+        self.size += len(successors)
+        while self.size > self.maxSuccessors:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def __contains__(self, state):
+        return state in self.entries
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,33 @@
+import heapq, numpy as np
+
+# Successors of an expanded node ordered by fCost in a binary heap, used by RBFS instead of sorting the whole list on every pass of its loop
+# best() and alternative() are successors[0] and successors[1].fCost of the sorted list, and backup(fCost) changes the fCost of the best one in O(log b)
+# Every entry is (fCost, rank, node): the ranks start at the expansion order and every backed up node gets a lower rank than all the others,
+# which is the same order a stable sort of the list gives on every pass (the best node is the first of the list, so it stays before the nodes of its same fCost)
+class SuccessorQueue():
+    def __init__(self, successors : list):
+        self.heap = [(successor.fCost, rank, successor) for rank, successor in enumerate(successors)]
+        heapq.heapify(self.heap)
+        self.nextRank = -1
+
+    def best(self):
+        return self.heap[0][2]
+
+    def alternative(self):
+        """fCost of the second best successor, or infinity if there is only one."""
+        heap = self.heap
+        if len(heap) == 1:
+            return np.inf
+        if len(heap) == 2 or heap[1] < heap[2]:
+            return heap[1][0]
+        return heap[2][0]
+
+    def backup(self, fCost):
+        """Sets the fCost of the best successor (the node's fCost too) and moves it to its new place."""
+        best = self.heap[0][2]
+        best.fCost = fCost
+        heapq.heapreplace(self.heap, (fCost, self.nextRank, best))
+        self.nextRank -= 1
+
+    def __len__(self):
+        return len(self.heap)
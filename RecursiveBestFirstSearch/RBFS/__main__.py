@@ -0,0 +1,98 @@
+# Command line solver: python -m RBFS ORIGIN GOAL [--dataset mexico1Node] [--engine rbfs|astar|wastar|idastar|bidirectional] [--compare] [--visualize] (from the RecursiveBestFirstSearch directory)
+# python -m RBFS --precompute-routes [--dataset mexico1Node] writes the all pairs RouteTable of the dataset, and then python -m RBFS ORIGIN GOAL --route-table answers from it
+# Without --visualize neither pygame nor matplotlib are imported (and pandas only the first time a country is used, see MapCache)
+# The import, startup (loading the problem) and search times are printed at the end, so the cold start of the solver can be tracked
+import time
+startTime = time.perf_counter()
+import argparse, json, os, sys
+
+# the modules of RBFS import each other by name (from Node import Node), so this directory has to be on the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import Solver
+importTime = time.perf_counter()
+
+def main(arguments = None):
+    parser = argparse.ArgumentParser(prog="python -m RBFS", description="Solves a route between two cities with RBFS (Recursive Best First Search).")
+    parser.add_argument("origin", nargs="?")
+    parser.add_argument("goal", nargs="?")
+    parser.add_argument("--dataset", default="mexico1Node", help="key of the adjacency data in the data file")
+    parser.add_argument("--data", default=Solver.defaultDataFile, help="json file with the adjacency data")
+    parser.add_argument("--country", default="Mexico")
+    parser.add_argument("--cities-per-state", type=int, default=1)
+    parser.add_argument("--maps-file", default=Solver.defaultMapsFile, help="csv with the coordinates of the cities")
+    parser.add_argument("--heuristic", choices=Solver.heuristics, default="euclidean", help="hCost: euclidean distance, or ALT landmark lower bounds (built once and cached)")
+    parser.add_argument("--landmarks", type=int, default=8, metavar="K", help="number of landmarks of the landmarks heuristic")
+    parser.add_argument("--recursive", action="store_true", help="use the recursive RBFS instead of IterativeRBFS")
+    parser.add_argument("--uncompiled", action="store_true", help="search on the city names (MapProblem) instead of the compiled graph")
+    parser.add_argument("--engine", choices=Solver.engines, default="rbfs", help="search algorithm (wastar is weighted A*)")
+    parser.add_argument("--weight", type=float, default=2, help="hCost weight of wastar")
+    parser.add_argument("--compare", action="store_true", help="solve the query with every engine and print their costs, expansions, memory and times")
+    parser.add_argument("--prune-cycles", action="store_true", help="rbfs skips the successors whose city is already on its current path")
+    parser.add_argument("--successor-cache", type=int, default=1 << 16, metavar="SUCCESSORS", help="budget of the cache of expanded successors, 0 disables it")
+    parser.add_argument("--precompute-routes", action="store_true", help="write the routes between all the cities of the dataset (RouteTable), no origin nor goal needed")
+    parser.add_argument("--route-table", action="store_true", help="read the route from the precomputed RouteTable of the dataset (searching with RBFS if there is none)")
+    parser.add_argument("--visualize", action="store_true", help="replay the search on a pygame window")
+    parser.add_argument("--stats", action="store_true", help="print the search stats")
+    parser.add_argument("--json", action="store_true", help="print the result and times as json")
+    arguments = parser.parse_args(arguments)
+    if arguments.precompute_routes:
+        table = Solver.precomputeRoutes(arguments.dataset, arguments.data)
+        print(f"Routes between {len(table)} cities written in {Solver.routeTableDirectory(arguments.dataset, arguments.data)} ({(time.perf_counter() - importTime) * 1000:.1f} ms)")
+        return 0
+    if arguments.origin is None or arguments.goal is None:
+        parser.error("the origin and goal are required (unless --precompute-routes)")
+
+    # with --route-table (and a precomputed table) the route is read from the table and there is no problem nor search context
+    problem = context = None
+    try:
+        routeTable = Solver.loadRouteTable(arguments.dataset, arguments.data) if arguments.route_table else None
+        if routeTable is not None:
+            for city in (arguments.origin, arguments.goal):
+                if city not in routeTable.ids : raise ValueError(f"{city} does not exist on the problem, please change to a valid node.")
+        else:
+            problem = Solver.loadProblem(arguments.origin, arguments.goal, arguments.dataset, arguments.data, arguments.country, arguments.cities_per_state, arguments.maps_file, compileGraph=not arguments.uncompiled,
+                                         heuristic=arguments.heuristic, landmarks=arguments.landmarks)
+    except (ValueError, OSError) as error:
+        print(error, file=sys.stderr)
+        return 2
+    startupTime = time.perf_counter()
+
+    if arguments.compare and problem is not None:
+        rows = Solver.compareEngines(problem, Solver.engines, not arguments.recursive, arguments.weight, arguments.successor_cache, arguments.prune_cycles)
+        if arguments.json:
+            print(json.dumps(rows, default=float))
+        else:
+            print(f"{'engine':<13} {'cost':>10} {'expanded':>9} {'generated':>10} {'stored':>7} {'ms':>8}")
+            for row in rows:
+                print(f"{row['engine']:<13} {row['cost'] if row['cost'] is not None else '-':>10} {row['expandedNodes']:>9} {row['generatedNodes']:>10} {row['maxStoredNodes']:>7} {row['seconds'] * 1000:>8.2f}")
+        return 0
+
+    successorCache = Solver.SuccessorCache(arguments.successor_cache) if arguments.successor_cache > 0 else None
+    if routeTable is not None:
+        result = routeTable.route(arguments.origin, arguments.goal)
+    elif arguments.visualize:
+        coordinates = Solver.loadCoordinates(arguments.country, arguments.cities_per_state, arguments.maps_file) if arguments.heuristic != "euclidean" else None
+        context = Solver.visualize(problem, arguments.country, not arguments.recursive, successorCache, arguments.engine, arguments.weight, coordinates, arguments.prune_cycles)
+    else:
+        context = Solver.solve(problem, not arguments.recursive, None, successorCache, arguments.engine, arguments.weight, arguments.prune_cycles)
+    if context is not None : result = Solver.solution(problem, context)
+    searchTime = time.perf_counter()
+
+    times = {"import": importTime - startTime, "startup": startupTime - importTime, "search": searchTime - startupTime}
+    if arguments.json:
+        output = {"origin": arguments.origin, "goal": arguments.goal, "path": None, "cost": None, "times": times}
+        if result is not None : output["path"], output["cost"] = result
+        if arguments.stats and context is not None : output["stats"] = context.stats.summary()
+        print(json.dumps(output, default=float))
+    else:
+        if result is None:
+            print("No solution found")
+        else:
+            path, cost = result
+            print(f"Here is the result: {' -> '.join(path)}, with a cost of {cost}")
+        if arguments.stats and context is not None : print("\nSEARCH STATS", context.stats, sep="\n")
+        print("\nTimes (ms): " + ", ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in times.items()))
+    return 0 if result is not None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
-import functools
+import functools, threading
+from collections import OrderedDict
 
 # This function is used to memoize the results of a function, so that if the same input is given, the function will return the same output. In this case, we will be using it to get the heuristic values of the nodes of the map
 def memoize(function, slot=None, maxsize=32):
@@ -15,4 +16,38 @@ def memoize(function, slot=None, maxsize=32):
         def memoized_fn(*args):
             return function(*args)
 
-    return memoized_fn
\ No newline at end of file
+    return memoized_fn
+
+# Least recently used cache, get(key, build) returns the value stored for key or calls build() to create it, and the least recently used entry is dropped once maxsize entries are stored
+# Used to keep values that are expensive to build and are asked for again across queries (for example, the heuristic table of a goal)
+# The cache can be shared by searches running in different threads, so every access holds self.lock
+class LRUCache():
+    def __init__(self, maxsize = 32):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, build):
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+            value = build()
+            self.entries[key] = value
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
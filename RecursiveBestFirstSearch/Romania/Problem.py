@@ -30,11 +30,10 @@ class MapProblem():
         nextState = State(actionName)
         return nextState
     
-    def pathCost(self, costSoFar, currentState : State, action : str, nextState : State, verbose = False):
-        for action in self.adjacencyMap[currentState.name]:
-            if action[0] == nextState.name:
-                actionCost = action[1]
-        pathCost = costSoFar + (actionCost or np.inf)
+    # action is the [neighbor, cost] pair of the adjacency list the child was made from, so its cost is read directly (each parallel road keeps its own cost)
+    def pathCost(self, costSoFar, currentState : State, action : list, nextState : State, verbose = False):
+        actionCost = np.inf if action is None or action[1] is None else action[1]
+        pathCost = costSoFar + actionCost
         if verbose : print(f"Costs between {currentState.name} | {nextState.name}: Cost so far: {costSoFar}, ActionCost: {actionCost} PathCost:  {pathCost}")
         return pathCost
     
@@ -3,7 +3,6 @@
 import bisect
 import collections
 import collections.abc
-import heapq
 import operator
 import os.path
 import random
@@ -693,10 +692,18 @@ class PriorityQueue:
     order) is returned first.
     If order is 'min', the item with minimum f(x) is
     returned first; if order is 'max', then it is the item with maximum f(x).
-    Also supports dict-like lookup."""
+    Also supports dict-like lookup.
+    The heap keeps an item -> position index, so membership and lookup are O(1),
+    and append, pop, decrease_key and deletion are O(log n).
+    Unlike the previous list based queue, items must be hashable (they are keys
+    of the index) and duplicates are not kept: equal items (for example Nodes
+    with the same state) are stored once, and appending an item that is already
+    in the queue replaces it, even if its f value is worse. Use decrease_key to
+    only replace it when the new f value is better."""
 
     def __init__(self, order='min', f=lambda x: x):
-        self.heap = []
+        self.heap = []  # [f(item), item] entries
+        self.positions = {}  # item -> index of its entry in heap
 
         if order == 'min':
             self.f = f
@@ -706,19 +713,46 @@ class PriorityQueue:
             raise ValueError("order must be either 'min' or max'.")
 
     def append(self, item):
-        """Insert item at its correct position."""
-        heapq.heappush(self.heap, (self.f(item), item))
+        """Insert item at its correct position. If an equal item is already in
+        the queue it is replaced by item (whatever their f values are), so the
+        queue never holds two equal items."""
+        value = self.f(item)
+        position = self.positions.get(item)
+        if position is None:
+            self.heap.append([value, item])
+            self.positions[item] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return
+        old_value = self.heap[position][0]
+        del self.positions[item]  # the new item may be equal but not the same object
+        self.heap[position] = [value, item]
+        self.positions[item] = position
+        if value < old_value:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
 
     def extend(self, items):
         """Insert each item in items at its correct position."""
         for item in items:
-            self.heap.append(item)
+            self.append(item)
+
+    def decrease_key(self, item):
+        """Replace the equal item in the queue with item if f(item) is better,
+        or insert it if there is none. Return True if the queue changed."""
+        position = self.positions.get(item)
+        if position is not None and not self.f(item) < self.heap[position][0]:
+            return False
+        self.append(item)
+        return True
 
     def pop(self):
         """Pop and return the item (with min or max f(x) value
         depending on the order."""
         if self.heap:
-            return heapq.heappop(self.heap)[1]
+            item = self.heap[0][1]
+            self._remove_at(0)
+            return item
         else:
             raise Exception('Trying to pop from empty PriorityQueue.')
 
@@ -728,17 +762,57 @@ class PriorityQueue:
 
     def __contains__(self, item):
         """Return True if item in PriorityQueue."""
-        return (self.f(item), item) in self.heap
+        return item in self.positions
 
     def __getitem__(self, key):
-        for _, item in self.heap:
-            if item == key:
-                return item
+        position = self.positions.get(key)
+        if position is not None:
+            return self.heap[position][1]
 
     def __delitem__(self, key):
-        """Delete the first occurrence of key."""
-        self.heap.remove((self.f(key), key))
-        heapq.heapify(self.heap)
+        """Delete the item equal to key."""
+        self._remove_at(self.positions[key])
+
+    def _remove_at(self, position):
+        heap = self.heap
+        del self.positions[heap[position][1]]
+        last = heap.pop()
+        if position < len(heap):
+            heap[position] = last
+            self.positions[last[1]] = position
+            self._sift_down(position)
+            self._sift_up(position)
+
+    def _sift_up(self, position):
+        heap, positions = self.heap, self.positions
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            heap[position] = heap[parent]
+            positions[heap[position][1]] = position
+            position = parent
+        heap[position] = entry
+        positions[entry[1]] = position
+
+    def _sift_down(self, position):
+        heap, positions = self.heap, self.positions
+        entry = heap[position]
+        size = len(heap)
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[position] = heap[child]
+            positions[heap[position][1]] = position
+            position = child
+        heap[position] = entry
+        positions[entry[1]] = position
 
 
 # ______________________________________________________________________________
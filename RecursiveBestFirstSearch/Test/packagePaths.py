@@ -0,0 +1,27 @@
+import os, sys
+
+# The packages of this directory import their modules by file name (from Node import Node), and several of them have modules with the same name (Node, State, utils, GraphProblem, this directory too)
+# usePackage puts the directories of the given packages first on the path, removes the other ones, and forgets the modules with those names that were loaded from another directory,
+# so a test module gets the modules of its package (it must import them at the top, before another test module changes the path)
+testDirectory = os.path.dirname(os.path.abspath(__file__))
+packagesDirectory = os.path.dirname(testDirectory)
+packages = ("RBFS", "AIMA", "AIMA_Mexico", "Romania", "MexicoVisualziation", "OnlyHeuristics")
+
+def usePackage(*names : str):
+    """usePackage("AIMA", "RBFS") imports the AIMA modules first, then the RBFS ones (the shared ones, like CompiledGraph)."""
+    directories = [os.path.join(packagesDirectory, name) for name in names]
+    for directory in [testDirectory] + [os.path.join(packagesDirectory, package) for package in packages]:
+        while directory in sys.path : sys.path.remove(directory)
+    sys.path[0:0] = directories
+    sys.path.append(testDirectory) # last, so the helpers of the tests can be imported, but not its own Node, State and GraphProblem
+
+    # moduleDirectories[name]: directory the module name must be loaded from (the first one that has it)
+    moduleDirectories = {}
+    for directory in directories:
+        for fileName in os.listdir(directory):
+            if fileName.endswith(".py") : moduleDirectories.setdefault(fileName[:-3], directory)
+    for moduleName, directory in moduleDirectories.items():
+        module = sys.modules.get(moduleName)
+        moduleFile = getattr(module, "__file__", None)
+        if module is not None and (moduleFile is None or os.path.dirname(os.path.abspath(moduleFile)) != directory):
+            del sys.modules[moduleName]
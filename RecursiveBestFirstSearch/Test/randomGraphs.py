@@ -0,0 +1,62 @@
+import random, math, heapq
+import numpy as np
+
+# Seeded random road maps for the tests, with the data.json layout ({city: [[neighbor, cost], ...]}) and a point on the plane for every city
+# Every road costs at least the straight line distance between its cities, so the straight line distance (PlaneMap) is a consistent heuristic
+
+# Same distance queries as CoordinateTable (getEuclideanDistance, distances_to), but with the straight line distance, so it can be the map of a MapProblem
+class PlaneMap():
+    def __init__(self, coordinates : dict):
+        self.coordinates : dict = coordinates
+
+    def getEuclideanDistance(self, city1Name, city2Name):
+        return math.dist(self.coordinates[city1Name], self.coordinates[city2Name])
+
+    def distances_to(self, goal, names) -> np.ndarray:
+        return np.array([self.getEuclideanDistance(name, goal) for name in names], dtype=np.float64)
+
+def randomMap(seed : int, size = 30, degree = 3, directed = False) -> tuple[dict, PlaneMap]:
+    """Returns (adjacencyMap, PlaneMap) of size cities with about degree roads each (both ways unless directed), some of them parallel or loops.
+    A random tree of roads both ways joins all the cities first, so every city can reach every other one."""
+    generator = random.Random(seed)
+    names = ["city{}".format(i) for i in range(size)]
+    coordinates = {name: (generator.uniform(0, 100), generator.uniform(0, 100)) for name in names}
+    adjacencyMap = {name: [] for name in names}
+
+    def addRoad(origin, destination, bothWays):
+        cost = math.ceil(math.dist(coordinates[origin], coordinates[destination])) + generator.randint(0, 20)
+        adjacencyMap[origin].append([destination, cost])
+        if bothWays : adjacencyMap[destination].append([origin, cost])
+
+    for i in range(1, size):
+        addRoad(names[i], names[generator.randrange(i)], True)
+    for origin in names:
+        for _ in range(degree - 1):
+            addRoad(origin, generator.choice(names), not directed)
+    return adjacencyMap, PlaneMap(coordinates)
+
+def randomGraphDict(seed : int, size = 30, degree = 3, directed = False) -> tuple[dict, dict]:
+    """Returns (graphDict, coordinates) of randomMap in the layout of the AIMA Graph ({city: {neighbor: cost}}, the cheapest of the parallel roads), and the point of every city (its locations)."""
+    adjacencyMap, planeMap = randomMap(seed, size=size, degree=degree, directed=directed)
+    graphDict = {}
+    for city, roads in adjacencyMap.items():
+        links = graphDict.setdefault(city, {})
+        for neighbor, cost in roads:
+            links[neighbor] = min(cost, links.get(neighbor, cost))
+    return graphDict, planeMap.coordinates
+
+def shortestCost(adjacencyMap : dict, origin, goal) -> float:
+    """Dijkstra on an adjacency map, returns the cost of the cheapest route from origin to goal (infinity if there is none)."""
+    costs = {origin: 0}
+    queue = [(0, origin)]
+    while queue:
+        cost, city = heapq.heappop(queue)
+        if city == goal:
+            return cost
+        if cost > costs[city]:
+            continue
+        for neighbor, length in adjacencyMap.get(city, ()):
+            if cost + length < costs.get(neighbor, np.inf):
+                costs[neighbor] = cost + length
+                heapq.heappush(queue, (cost + length, neighbor))
+    return np.inf
@@ -0,0 +1,43 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+from Problem import MapProblem
+from State import State
+from AStar import AStarContext
+from IDAStar import IDAStarContext
+from randomGraphs import randomMap, shortestCost, PlaneMap
+import pytest
+
+def assertRoute(adjacencyMap, problem, result, origin, goal):
+    """The solution goes from origin to goal along roads of the map, and its legs add up to its cost."""
+    names = result.extractSolution(problem).names(problem)
+    assert (names[0], names[-1]) == (origin, goal)
+    legCosts = [min(cost for neighbor, cost in adjacencyMap[city] if neighbor == nextCity) for city, nextCity in zip(names, names[1:])]
+    assert sum(legCosts) == result.pathCost
+
+# With the straight line distance (consistent) A* and IDA* return a cheapest route, and weighted A* a route that costs at most weight times the cheapest one
+@pytest.mark.parametrize("seed", range(12))
+@pytest.mark.parametrize("compileGraph", [False, True])
+def testAStarEnginesAgainstDijkstra(seed, compileGraph):
+    adjacencyMap, planeMap = randomMap(seed, size=20, degree=3, directed=seed % 2 == 1)
+    origin, goal = "city{}".format(seed % 5), "city{}".format(19 - seed % 7)
+    problem = MapProblem(State(origin), State(goal), adjacencyMap, planeMap)
+    if compileGraph : problem = problem.compile()
+    expected = shortestCost(adjacencyMap, origin, goal)
+
+    for context in (AStarContext(problem), IDAStarContext(problem)):
+        result = context.search()
+        assert result.pathCost == expected
+        assertRoute(adjacencyMap, problem, result, origin, goal)
+
+    for weight in (1.5, 2, 5):
+        result = AStarContext(problem, weight=weight).search()
+        assert expected <= result.pathCost <= weight * expected
+        assertRoute(adjacencyMap, problem, result, origin, goal)
+
+# A goal that can not be reached gives no solution, IDA* does not go around the cycle (it goes through every simple path of each limit, so the map is small)
+@pytest.mark.parametrize("engine", [AStarContext, IDAStarContext])
+def testAStarEnginesWithoutSolution(engine):
+    adjacencyMap = {"a": [["b", 1]], "b": [["c", 1], ["a", 1]], "c": [["a", 1]], "d": [["a", 1]]}
+    planeMap = PlaneMap({"a": (0, 0), "b": (1, 0), "c": (0, 1), "d": (1, 1)})
+    assert engine(MapProblem(State("a"), State("d"), adjacencyMap, planeMap)).search() is None
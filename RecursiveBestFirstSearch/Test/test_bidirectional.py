@@ -0,0 +1,48 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+from Problem import MapProblem
+from State import State
+from Bidirectional import BidirectionalContext
+from AStar import AStarContext
+from randomGraphs import randomMap, shortestCost
+import pytest
+
+# With a consistent heuristic (the straight line distance of a symmetric map) bidirectional A* has to return a cheapest route, the same cost as Dijkstra and A*
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("compileGraph", [False, True])
+def testBidirectionalIsOptimal(seed, compileGraph):
+    adjacencyMap, planeMap = randomMap(seed, size=40, degree=3, directed=seed % 2 == 1)
+    origin, goal = "city{}".format(seed % 5), "city{}".format(39 - seed % 7)
+    problem = MapProblem(State(origin), State(goal), adjacencyMap, planeMap)
+    if compileGraph : problem = problem.compile()
+
+    context = BidirectionalContext(problem)
+    result = context.search()
+    assert result is not None
+    assert result.pathCost == shortestCost(adjacencyMap, origin, goal)
+    assert result.pathCost == AStarContext(problem).search().pathCost
+
+    # the joined path is a real route of the map: it goes from the origin to the goal, and its legs add up to its cost
+    names = result.extractSolution(problem).names(problem)
+    assert (names[0], names[-1]) == (origin, goal)
+    legCosts = [min(cost for neighbor, cost in adjacencyMap[city] if neighbor == nextCity) for city, nextCity in zip(names, names[1:])]
+    assert sum(legCosts) == result.pathCost
+
+def testBidirectionalOriginIsGoal():
+    adjacencyMap, planeMap = randomMap(0, size=5)
+    problem = MapProblem(State("city3"), State("city3"), adjacencyMap, planeMap)
+    result = BidirectionalContext(problem).search()
+    assert result.pathCost == 0 and result.depth() == 0
+
+# The stored nodes are the ones in the frontiers, so a node stops counting when it is expanded, and once A* has no frontier left nothing is stored
+def testStoredNodesAreTheFrontier():
+    adjacencyMap, planeMap = randomMap(2, size=200)
+    problem = MapProblem(State("city0"), State("city150"), adjacencyMap, planeMap).compile()
+    for context in (AStarContext(problem), BidirectionalContext(problem)):
+        context.search()
+        assert 0 < context.storedNodes <= context.stats.maxStoredNodes < context.stats.generatedNodes
+    adjacencyMap["island"] = []
+    planeMap.coordinates["island"] = (50, 50)
+    context = AStarContext(MapProblem(State("city0"), State("island"), adjacencyMap, planeMap))
+    assert context.search() is None and context.storedNodes == 0
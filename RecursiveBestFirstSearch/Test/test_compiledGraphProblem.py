@@ -0,0 +1,40 @@
+from packagePaths import usePackage
+usePackage("AIMA", "RBFS")
+
+from Node import Node
+from UnidirectedGraph import UndirectedGraph
+from GraphProblem import GraphProblem
+from randomGraphs import randomMap, shortestCost
+import heapq, itertools
+import pytest
+
+# Uniform cost search with the AIMA Node, so it runs the same on a GraphProblem and on its compiled problem
+def uniformCostSearch(problem):
+    ties = itertools.count()
+    frontier, reached = [(0, next(ties), Node(problem.initial))], {}
+    while frontier:
+        cost, _, node = heapq.heappop(frontier)
+        if problem.goal_test(node.state):
+            return node
+        if reached.get(node.state, cost + 1) <= cost:
+            continue
+        reached[node.state] = cost
+        for child in node.expand(problem):
+            heapq.heappush(frontier, (child.pathCost, next(ties), child))
+    return None
+
+# The compiled problem reads the edge costs from its (id, cost) actions, and node.solution(problem) names its states, so both problems give the same solutions
+@pytest.mark.parametrize("seed", range(10))
+def testCompiledProblemGivesTheSameSolution(seed):
+    adjacencyMap, planeMap = randomMap(seed, size=25, degree=3)
+    graph = UndirectedGraph({city: {neighbor: cost for neighbor, cost in roads} for city, roads in adjacencyMap.items()})
+    graph.locations = planeMap.coordinates
+    problem = GraphProblem("city0", "city{}".format(24 - seed), graph)
+    compiled = problem.compile()
+
+    result, compiledResult = uniformCostSearch(problem), uniformCostSearch(compiled)
+    graphDict = {city: [[neighbor, cost] for neighbor, cost in links.items()] for city, links in graph.graph_dict.items()}
+    assert result.pathCost == compiledResult.pathCost == shortestCost(graphDict, problem.initial, problem.goal)
+    assert result.solution() == result.solution(problem) == compiledResult.solution(compiled)
+    assert compiledResult.solution(compiled)[-1] == problem.goal
+    assert all(compiled.stateName(compiled.result(compiled.initial, action)) in graph.get("city0") for action in compiled.actions(compiled.initial))
@@ -0,0 +1,33 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+from Problem import MapProblem
+from State import State
+from SearchContext import SearchContext
+from randomGraphs import randomMap, PlaneMap
+import pytest
+
+# A cheapest route never visits a state twice, so skipping the successors already on the path keeps the solution and only removes work
+@pytest.mark.parametrize("seed", range(12))
+@pytest.mark.parametrize("iterative", [False, True])
+def testPruningKeepsTheSolution(seed, iterative):
+    adjacencyMap, planeMap = randomMap(seed, size=12, degree=2, directed=seed % 2 == 1)
+    problem = MapProblem(State("city0"), State("city{}".format(11 - seed % 4)), adjacencyMap, planeMap).compile()
+
+    plain = SearchContext(problem, iterative=iterative)
+    pruned = SearchContext(problem, iterative=iterative, pruneCycles=True)
+    assert plain.search().pathCost == pruned.search().pathCost
+    assert pruned.stats.expandedNodes <= plain.stats.expandedNodes
+    assert plain.stats.prunedSuccessors == 0
+    # every city has a road back to the one it was reached from, so anything deeper than the origin prunes its parent
+    if pruned.stats.expandedNodes > 1 : assert pruned.stats.prunedSuccessors > 0
+    assert not pruned.pathStates
+
+# Without pruning RBFS goes around a cycle forever when the goal can not be reached, with it the search ends with no solution
+@pytest.mark.parametrize("iterative", [False, True])
+def testPruningEndsWithoutSolution(iterative):
+    adjacencyMap = {"a": [["b", 1]], "b": [["c", 1], ["a", 1]], "c": [["a", 1]], "d": [["a", 1]]}
+    planeMap = PlaneMap({"a": (0, 0), "b": (1, 0), "c": (0, 1), "d": (1, 1)})
+    context = SearchContext(MapProblem(State("a"), State("d"), adjacencyMap, planeMap), iterative=iterative, pruneCycles=True)
+    assert context.search() is None
+    assert context.stats.prunedSuccessors > 0
@@ -0,0 +1,80 @@
+from packagePaths import usePackage
+usePackage("AIMA", "RBFS")
+
+from UnidirectedGraph import Graph, UndirectedGraph
+from GraphProblem import GraphProblem
+from DStarLite import DStarLite
+from randomGraphs import randomGraphDict, shortestCost
+import random, math
+import pytest
+
+# Graph of a random map (the cheapest of its parallel roads), with the cities' points as locations, so the straight line hCost of DStarLite is consistent
+def randomGraph(seed, size, directed):
+    graphDict, coordinates = randomGraphDict(seed, size, directed=directed)
+    graph = Graph(graphDict) if directed else UndirectedGraph(graphDict)
+    graph.locations = coordinates
+    return graph
+
+def dijkstraCost(graph, origin, goal):
+    return shortestCost({city: [[neighbor, cost] for neighbor, cost in links.items()] for city, links in graph.graph_dict.items()}, origin, goal)
+
+def assertRoute(graph, route, origin, goal):
+    expected = dijkstraCost(graph, origin, goal)
+    if expected == math.inf:
+        assert route is None
+        return
+    path, cost = route
+    assert cost == expected
+    assert (path[0], path[-1]) == (origin, goal)
+    assert sum(graph.get(city, nextCity) for city, nextCity in zip(path, path[1:])) == cost
+
+# After every change of a link (cheaper, more expensive or new) and every move of the start along the route, the repaired route is the one a search from scratch finds
+@pytest.mark.parametrize("seed", range(10))
+def testRoutesFollowChanges(seed):
+    graph = randomGraph(seed, 30, directed=seed % 2 == 1)
+    names = sorted(graph.graph_dict)
+    generator = random.Random(seed)
+    planner = DStarLite(GraphProblem("city0", "city29", graph))
+    for step in range(40):
+        A, B = generator.sample(names, 2)
+        length = math.ceil(math.dist(graph.locations[A], graph.locations[B])) + generator.choice([0, 5, 50, 1000])
+        graph.connect(A, B, length)
+        route = planner.route()
+        assertRoute(graph, route, planner.start, planner.goal)
+        if route is not None and step % 5 == 4 and len(route[0]) > 2:
+            planner.moveTo(route[0][1])
+            assertRoute(graph, planner.route(), planner.start, planner.goal)
+    planner.close()
+    assert planner.edgeChanged not in graph.listeners
+
+# On an undirected graph connect changes both links, and the listeners are called once, when both of them are already changed
+def testUndirectedConnectNotifiesOnce():
+    graph = randomGraph(3, 20, directed=False)
+    planner = DStarLite(GraphProblem("city0", "city19", graph))
+    notifications, routes = [], []
+    graph.subscribe(lambda A, B, oldDistance, distance: notifications.append((A, B, graph.get(A, B), graph.get(B, A))))
+
+    def watcher(route):
+        assertRoute(graph, route, "city0", "city19")
+        routes.append(route)
+
+    planner.watch(watcher)
+    path, cost = planner.currentRoute
+    for city, nextCity in zip(path, path[1:]):
+        connects = len(notifications)
+        graph.connect(city, nextCity, graph.get(city, nextCity) + 500)
+        assert len(notifications) == connects + 1
+        assert notifications[-1] == (city, nextCity, graph.get(city, nextCity), graph.get(city, nextCity))
+    graph.connect(path[0], path[1], graph.get(path[0], path[1]))
+    assert len(notifications) == len(path) - 1 # setting the same length again is not a change
+    assert routes and planner.currentRoute == routes[-1]
+    planner.unwatch(watcher)
+
+# If the g values are left inconsistent the cheapest successors can go around a cycle, the route gives up after as many hops as a simple path can have
+def testRouteStopsOnCycles():
+    graph = Graph({"a": {"b": 1}, "b": {"a": 1, "c": 1}, "c": {"d": 1}})
+    planner = DStarLite(GraphProblem("a", "d", graph))
+    assert planner.route() == (["a", "b", "c", "d"], 3)
+    planner.computeShortestPath = lambda: None
+    planner.g.update({"a": 0, "b": 0, "c": 10})
+    assert planner.route() is None
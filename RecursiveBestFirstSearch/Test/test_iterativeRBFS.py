@@ -0,0 +1,32 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+from Problem import MapProblem
+from State import State
+from SearchContext import SearchContext
+from SearchEvents import SearchEventBuffer
+from randomGraphs import randomMap
+import pytest
+
+# IterativeRBFS has to expand the same nodes in the same order as the recursive RBFS, so both give the same solution, counters and event stream
+@pytest.mark.parametrize("seed", range(12))
+@pytest.mark.parametrize("compileGraph", [False, True])
+def testIterativeMatchesRecursive(seed, compileGraph):
+    adjacencyMap, planeMap = randomMap(seed, size=12, degree=2, directed=seed % 2 == 1)
+    problem = MapProblem(State("city0"), State("city{}".format(11 - seed % 4)), adjacencyMap, planeMap)
+    if compileGraph : problem = problem.compile()
+
+    contexts = []
+    for iterative in (False, True):
+        context = SearchContext(problem, events=SearchEventBuffer(maxsize=None), iterative=iterative)
+        context.search()
+        contexts.append(context)
+    recursive, iterative = contexts
+
+    assert (recursive.result is None) == (iterative.result is None)
+    if recursive.result is not None:
+        assert recursive.result.pathCost == iterative.result.pathCost
+        assert recursive.result.extractSolution(problem).stateIds.tolist() == iterative.result.extractSolution(problem).stateIds.tolist()
+    for counter in ("expandedNodes", "generatedNodes", "backups", "maxDepth", "heuristicEvaluations"):
+        assert getattr(recursive.stats, counter) == getattr(iterative.stats, counter), counter
+    assert list(recursive.events.events) == list(iterative.events.events)
@@ -0,0 +1,48 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+import Solver, BatchSolver
+from Landmarks import LandmarkHeuristic, dijkstra
+from CompiledGraph import CompiledGraph
+from Problem import CompiledMapProblem
+from State import State
+import itertools, numpy as np
+import pytest
+
+# The landmark heuristic is admissible, so solving many queries with it in worker processes (which load it back from the temporary directory) must give the shortest routes
+def testBatchSolveWithLandmarks(tmp_path):
+    problem = Solver.loadProblem("Cancun", "Tijuana", heuristic="landmarks", landmarks=4, landmarkDirectory=str(tmp_path))
+    assert isinstance(problem.map, LandmarkHeuristic)
+    names = problem.graph.names[:8]
+    queries = [(origin, goal) for origin, goal in itertools.product(names, names) if origin != goal]
+
+    results = BatchSolver.solve_many(problem, queries, workers=2, chunksize=4)
+    assert results == BatchSolver.solve_many(problem, queries, workers=1)
+    for (origin, goal), result in zip(queries, results):
+        shortest = dijkstra(problem.graph, problem.graph.id(origin))[problem.graph.id(goal)]
+        if shortest == np.inf:
+            assert result is None
+        else:
+            path, cost = result
+            assert (path[0], path[-1]) == (origin, goal)
+            assert cost == shortest
+
+# A subset (the one BatchSolver sends to the workers) gives the same bounds, and keeps the landmarks that are in it
+def testLandmarkSubsetKeepsBounds():
+    heuristic = LandmarkHeuristic.build(CompiledGraph.fromAdjacencyMap(Solver.loadAdjacency()), 4)
+    names = heuristic.names[::3]
+    subset = heuristic.subset(names)
+    assert subset.names == names
+    assert all(subset.getEuclideanDistance(origin, goal) == heuristic.getEuclideanDistance(origin, goal) for origin, goal in itertools.product(names, names))
+    assert [subset.names[landmark] for landmark in subset.landmarks if landmark >= 0] == [heuristic.names[landmark] for landmark in heuristic.landmarks if heuristic.names[landmark] in names]
+
+# The queries are checked before any of them is solved, and solving them in this process leaves no problem behind for the next call
+def testBatchSolveChecksQueries():
+    problem = Solver.loadProblem("Cancun", "Tijuana")
+    with pytest.raises(ValueError, match="Atlantis"):
+        BatchSolver.solve_many(problem, [("Cancun", "Tijuana"), ("Cancun", "Atlantis")], workers=1)
+    with pytest.raises(ValueError, match="no map"):
+        BatchSolver.solve_many(CompiledMapProblem(State("Cancun"), State("Tijuana"), problem.graph), [("Cancun", "Tijuana")], workers=1)
+    path, cost = BatchSolver.solve_many(problem, [("Cancun", "Tijuana")], workers=1)[0]
+    assert (path[0], path[-1]) == ("Cancun", "Tijuana")
+    assert BatchSolver.workerProblem is None
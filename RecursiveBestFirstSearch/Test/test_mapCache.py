@@ -0,0 +1,34 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+import MapCache
+import hashlib, json, os, stat
+import numpy as np
+
+# The hash of a file is read back from hashes.json while its size and mtime do not change, and computed again (and stored) when they do
+def testFileHashIsKeyedOnSizeAndMtime(tmp_path):
+    csvFile, stampDirectory = tmp_path / "cities.csv", tmp_path / "cache"
+    csvFile.write_text("city,lat,lng\n")
+    MapCache.fileHashes.clear()
+    assert MapCache.fileHash(str(csvFile), stampDirectory=str(stampDirectory)) == hashlib.sha256(csvFile.read_bytes()).hexdigest()
+
+    # another process (no hashes in memory) trusts the stamp instead of reading the file
+    stamps = json.loads((stampDirectory / "hashes.json").read_text())
+    stamps[str(csvFile)][2] = "stamped"
+    (stampDirectory / "hashes.json").write_text(json.dumps(stamps))
+    MapCache.fileHashes.clear()
+    assert MapCache.fileHash(str(csvFile), stampDirectory=str(stampDirectory)) == "stamped"
+
+    csvFile.write_text("city,lat,lng\nCancun,21.1,-86.8\n")
+    assert MapCache.fileHash(str(csvFile), stampDirectory=str(stampDirectory)) == hashlib.sha256(csvFile.read_bytes()).hexdigest()
+    assert json.loads((stampDirectory / "hashes.json").read_text())[str(csvFile)][2] == hashlib.sha256(csvFile.read_bytes()).hexdigest()
+
+# The columns are written in a private temporary directory, but the cache gets the permissions of the directory it is in
+def testSavedColumnsAreNotPrivate(tmp_path):
+    cacheDirectory = tmp_path / "cache"
+    cacheDirectory.mkdir()
+    os.chmod(cacheDirectory, 0o755)
+    directory = str(cacheDirectory / "Mexico_1_v1_0123456789abcdef")
+    MapCache.saveColumns(directory, ["Cancun"], ["Quintana Roo"], np.array([[21.1, -86.8]]))
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o755
+    assert MapCache.loadColumns(directory)[0] == ["Cancun"]
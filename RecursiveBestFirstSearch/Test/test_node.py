@@ -0,0 +1,11 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+from Node import Node
+from State import State
+
+# A root node has no parent, and the nodes of a CompiledMapProblem have integer states, printing either of them must not fail
+def testNodeStr():
+    assert str(Node(State("A"))) == "Node: A, pathCost: 0, fCost: 0, action: None, parent: None"
+    assert str(Node(3, Node(2), (3, 5.0), 5.0)) == "Node: 3, pathCost: 5.0, fCost: 0, action: (3, 5.0), parent: 2"
+    assert str(Node(State("B"), Node(State("A")), ["B", 4], 4)) == "Node: B, pathCost: 4, fCost: 0, action: ['B', 4], parent: A"
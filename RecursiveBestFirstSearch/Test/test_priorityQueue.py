@@ -0,0 +1,67 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+from myutils import PriorityQueue
+import random
+import pytest
+
+# Random appends, decrease_keys, deletions and pops, checked against a plain dict of the best f value of every item: the queue pops in order, and its index always matches its heap
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("order", ["min", "max"])
+def testOperationsKeepTheOrder(seed, order):
+    generator = random.Random(seed)
+    values = {}
+    queue = PriorityQueue(order, f=lambda item: values[item])
+    expected = {}
+    better = (lambda new, old: new < old) if order == "min" else (lambda new, old: new > old)
+    for _ in range(300):
+        item, value = generator.randrange(40), generator.randrange(1000)
+        operation = generator.random()
+        if operation < 0.3:
+            values[item] = value
+            queue.append(item)
+            expected[item] = value
+        elif operation < 0.6:
+            changed = item not in expected or better(value, expected[item])
+            if changed : values[item] = value # f reads values, so a rejected value is never written
+            assert queue.decrease_key(item) == changed
+            expected[item] = values[item]
+        elif operation < 0.8 and item in expected:
+            del queue[item]
+            del expected[item]
+        elif expected:
+            best = (min if order == "min" else max)(expected.values())
+            popped = queue.pop()
+            assert expected.pop(popped) == best
+        assert len(queue) == len(expected)
+        assert all(queue.positions[entry[1]] == position for position, entry in enumerate(queue.heap))
+        assert all((item in queue) == (item in expected) for item in range(40))
+
+    popped = [values[queue.pop()] for _ in range(len(queue))]
+    assert popped == sorted(popped, reverse=order == "max")
+
+# Items equal by name, with their own f value (like the Nodes of a state)
+class Entry:
+    def __init__(self, name, value):
+        self.name, self.value = name, value
+
+    def __eq__(self, other):
+        return self.name == other.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+# Appending an item that is already in the queue replaces it even with a worse value, decrease_key only with a better one, and equal items are kept once
+def testReplaceSemantics():
+    queue = PriorityQueue(f=lambda entry: entry.value)
+    queue.extend([Entry("a", 5), Entry("b", 3)])
+    queue.append(Entry("b", 8))
+    assert len(queue) == 2 and queue[Entry("b", 0)].value == 8
+    assert not queue.decrease_key(Entry("b", 9))
+    assert queue.decrease_key(Entry("b", 1))
+    assert queue.decrease_key(Entry("c", 4))
+    assert [(entry.name, entry.value) for entry in (queue.pop(), queue.pop(), queue.pop())] == [("b", 1), ("c", 4), ("a", 5)]
+    with pytest.raises(Exception):
+        queue.pop()
+    with pytest.raises(ValueError):
+        PriorityQueue(order="middle")
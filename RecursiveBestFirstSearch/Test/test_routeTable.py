@@ -0,0 +1,43 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+from RouteTable import RouteTable
+from CompiledGraph import CompiledGraph
+from randomGraphs import randomMap, shortestCost
+import itertools, math
+import numpy as np
+import pytest
+
+# Every route of the table (built in memory, or written to a directory and memory mapped back) costs the same as Dijkstra, and is a real route of the map
+# a directed map with a city that has no roads out, and one that no road goes into, also has pairs that can not be reached
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("saved", [False, True])
+def testRoutesAgainstDijkstra(seed, saved, tmp_path):
+    adjacencyMap, _ = randomMap(seed, size=25, degree=3, directed=seed % 2 == 1)
+    adjacencyMap["sink"] = []
+    adjacencyMap["city3"].append(["sink", 7])
+    adjacencyMap["source"] = [["city0", 5]]
+    graph = CompiledGraph.fromAdjacencyMap(adjacencyMap)
+    table = RouteTable.build(graph, str(tmp_path) if saved else None)
+    if saved : table = RouteTable.load(str(tmp_path))
+
+    for origin, goal in itertools.product(adjacencyMap, adjacencyMap):
+        expected = shortestCost(adjacencyMap, origin, goal)
+        route = table.route(origin, goal)
+        if expected == np.inf:
+            assert route is None
+            assert table.distances[table.ids[origin], table.ids[goal]] == np.inf
+            continue
+        path, cost = route
+        assert math.isclose(cost, expected)
+        assert (path[0], path[-1]) == (origin, goal)
+        legCosts = [min(length for neighbor, length in adjacencyMap[city] if neighbor == nextCity) for city, nextCity in zip(path, path[1:])]
+        assert math.isclose(sum(legCosts), cost)
+    assert table.route("sink", "city0") is None and table.route("city0", "source") is None
+
+# Next hops that go around a cycle (a corrupted table) end in a ValueError instead of an endless walk
+def testCyclingNextHopsAreReported():
+    table = RouteTable(["a", "b", "c"], np.array([[0, 1, 2], [1, 0, 1], [2, 1, 0]], dtype=np.float64), np.array([[0, 1, 1], [0, 1, 0], [1, 1, 2]], dtype=np.int32))
+    assert table.route("a", "b") == (["a", "b"], 1.0)
+    with pytest.raises(ValueError):
+        table.route("a", "c")
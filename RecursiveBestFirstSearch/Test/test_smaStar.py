@@ -0,0 +1,37 @@
+from packagePaths import usePackage
+usePackage("AIMA", "RBFS")
+
+from UnidirectedGraph import Graph, UndirectedGraph
+from GraphProblem import GraphProblem
+from SMAStar import SMAStar
+from randomGraphs import randomGraphDict, shortestCost
+import math
+import pytest
+
+# SMA* with the straight line hCost of a random map (consistent) returns a cheapest route whenever it fits in its memory, and it always does when the memory has room for every city
+# with less memory the route can be a more expensive one, but it is still a route of the map, and the memory is never exceeded
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("maxNodes", [4, 8, 31, 1000])
+@pytest.mark.parametrize("compileGraph", [False, True])
+def testSMAStarIsOptimalWhenTheRouteFits(seed, maxNodes, compileGraph):
+    graphDict, coordinates = randomGraphDict(seed, 30, directed=seed % 2 == 1)
+    graph = Graph(graphDict) if seed % 2 == 1 else UndirectedGraph(graphDict)
+    graph.locations = coordinates
+    origin, goal = "city{}".format(seed % 5), "city{}".format(29 - seed % 7)
+    problem = GraphProblem(origin, goal, graph)
+    if compileGraph : problem = problem.compile()
+
+    search = SMAStar(problem, maxNodes=maxNodes)
+    result = search.search()
+    assert search.maxNodesInMemory <= maxNodes
+    expected = shortestCost({city: list(links.items()) for city, links in graph.graph_dict.items()}, origin, goal)
+    if result is None:
+        assert maxNodes < len(graphDict)
+        return
+    path = [origin] + result.solution(problem)
+    assert path[-1] == goal
+    assert math.isclose(sum(graph.get(city, nextCity) for city, nextCity in zip(path, path[1:])), result.pathCost)
+    if maxNodes > len(graphDict): # every simple route fits
+        assert result.pathCost == expected
+    else:
+        assert result.pathCost >= expected
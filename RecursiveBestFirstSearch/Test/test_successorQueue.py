@@ -0,0 +1,72 @@
+from packagePaths import usePackage
+usePackage("RBFS")
+
+from Problem import MapProblem
+from State import State
+from SearchContext import SearchContext
+from SearchEvents import SearchEventBuffer
+from SuccessorQueue import SuccessorQueue
+from randomGraphs import PlaneMap
+import random
+import numpy as np
+import pytest
+
+# RBFS as it was before SuccessorQueue: the successors are a list sorted (stable) by fCost on every pass of the loop
+class SortedRBFSContext(SearchContext):
+    def RBFS(self, node, fLimit, depth = 0):
+        if self.problem.goalTest(node.state):
+            return node, 0
+        successors = self.evaluateSuccessors(node)
+        if len(successors) == 0:
+            return None, np.inf
+        while True:
+            successors.sort(key=lambda succesor: succesor.fCost)
+            best = successors[0]
+            if best.fCost > fLimit or best.fCost == np.inf:
+                return None, best.fCost
+            alternative = successors[1].fCost if len(successors) > 1 else np.inf
+            if self.events is not None : self.events.append(("open", best.state, best.pathCost))
+            result, fCost = self.RBFS(best, min(fLimit, alternative), depth + 1)
+            best.fCost = fCost
+            if result is not None:
+                return result, best.fCost
+            self.stats.backups += 1
+            if self.events is not None : self.events.append(("backup", best.state, best.fCost))
+
+# Small integer costs and heuristics, so many successors tie on fCost and the order between them decides what RBFS expands
+# a road from every city to the next one makes the goal reachable (otherwise RBFS goes around the cycles forever)
+def tiedProblem(seed, size = 7):
+    generator = random.Random(seed)
+    names = ["city{}".format(i) for i in range(size)]
+    adjacencyMap = {name: [] for name in names}
+    for i, name in enumerate(names):
+        if i + 1 < size : adjacencyMap[name].append([names[i + 1], generator.randint(1, 3)])
+        for _ in range(2):
+            adjacencyMap[name].append([generator.choice(names), generator.randint(1, 3)])
+    hCosts = {name: generator.randint(0, 2) for name in names}
+    hCosts[names[-1]] = 0
+    problem = MapProblem(State(names[0]), State(names[-1]), adjacencyMap, PlaneMap({name: (0, 0) for name in names}))
+    return problem, lambda node, *args: hCosts[problem.stateName(node.state)]
+
+# The heap gives the ties the same order as the stable sort, so RBFS expands and backs up the same nodes in the same order, and finds the same solution
+@pytest.mark.parametrize("seed", range(100))
+def testHeapMatchesStableSort(seed):
+    problem, hFunc = tiedProblem(seed)
+    contexts = [context(problem, hFunc, SearchEventBuffer(maxsize=None), iterative) for context, iterative in ((SortedRBFSContext, False), (SearchContext, False), (SearchContext, True))]
+    results = [context.search() for context in contexts]
+    sortedRBFS = contexts[0]
+    for context, result in zip(contexts[1:], results[1:]):
+        assert list(context.events.events) == list(sortedRBFS.events.events)
+        assert result.pathCost == results[0].pathCost
+        assert result.extractSolution(problem).stateIds.tolist() == results[0].extractSolution(problem).stateIds.tolist()
+        assert context.stats.backups == sortedRBFS.stats.backups
+
+def testBestAndAlternative():
+    nodes = [type("Entry", (), {"fCost": fCost})() for fCost in (4, 2, 2, 7)]
+    successors = SuccessorQueue(nodes)
+    assert successors.best() is nodes[1] and successors.alternative() == 2
+    successors.backup(5) # the backed up node goes before the 7 and after the other 2 and the 4
+    assert successors.best() is nodes[2] and successors.alternative() == 4
+    successors.backup(4) # same fCost as nodes[0], a backed up node goes first among its ties
+    assert successors.best() is nodes[2] and successors.alternative() == 4
+    assert SuccessorQueue(nodes[:1]).alternative() == np.inf